@@ -0,0 +1,52 @@
+/**
+ * StateDecoder - Rebuilds snake bodies from game_state delta frames
+ *
+ * Keyframes carry every snake's full body. Frames in between only carry the
+ * head cells added since the previous frame ("head") and the new length ("len"),
+ * applied on top of the frame numbered "base", and leave out foods when they
+ * haven't changed. If a frame is missed, bodies are held as they were and foods
+ * are left out until the next keyframe, which the server sends as soon as it
+ * drops a frame for this client.
+ */
+
+export class StateDecoder {
+    constructor() {
+        this.bodyFrame = null; // frame number the held bodies are exact for
+    }
+
+    /**
+     * Forget the current frame, e.g. when a new round starts
+     */
+    reset() {
+        this.bodyFrame = null;
+    }
+
+    /**
+     * Fill in snake bodies and unchanged foods on a game_state, using the
+     * previously applied state
+     */
+    decode(state, prevState) {
+        if (state.frame == null) return state;
+
+        const inSync = !state.key && this.bodyFrame !== null && this.bodyFrame === state.base;
+        const prevPlayers = (prevState && prevState.players) || {};
+
+        if (!state.foods) {
+            // Omitted foods are only unchanged relative to the frame we hold if
+            // that frame is the base; otherwise they are unknown until a keyframe
+            state.foods = (inSync && prevState && prevState.foods) || {};
+        }
+
+        for (const [pid, player] of Object.entries(state.players || {})) {
+            const snake = player.snake;
+            if (!snake || snake.body) continue;
+
+            const prevSnake = prevPlayers[pid] && prevPlayers[pid].snake;
+            const prevBody = (prevSnake && prevSnake.body) || [];
+            snake.body = inSync ? snake.head.concat(prevBody).slice(0, snake.len) : prevBody;
+        }
+
+        this.bodyFrame = (state.key || inSync) ? state.frame : null;
+        return state;
+    }
+}
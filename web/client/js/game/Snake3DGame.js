@@ -141,6 +141,21 @@ export class Snake3DGame {
     updateState(state) {
         const firstUpdate = !this.gameState;
         this.prevState = this.gameState;
+
+        // Delta states omit static fields; carry them forward. A state for a new
+        // walls_version (e.g. the next duel round) brings its own walls, and every
+        // frame is redrawn from scratch, so there is no cached map to reset
+        if (!firstUpdate && this.gameState) {
+            if (!state.walls && this.gameState.walls) state.walls = this.gameState.walls;
+            if (!state.quadrant_bounds && this.gameState.quadrant_bounds) state.quadrant_bounds = this.gameState.quadrant_bounds;
+            if (!state.game_type && this.gameState.game_type) state.game_type = this.gameState.game_type;
+            if (!state.mode && this.gameState.mode) state.mode = this.gameState.mode;
+            if (!state.barrier_density && this.gameState.barrier_density) state.barrier_density = this.gameState.barrier_density;
+            if (!state.map_size && this.gameState.map_size) state.map_size = this.gameState.map_size;
+            if (state.grid_width == null) state.grid_width = this.gameState.grid_width;
+            if (state.grid_height == null) state.grid_height = this.gameState.grid_height;
+        }
+
         this.gameState = state;
         
         if (firstUpdate) {
@@ -781,6 +796,8 @@ export class Snake3DGame {
      */
     onGameOver(winnerId, finalState) {
         this.running = false;
+        // The final state leaves out walls the client already holds
+        if (!finalState.walls && this.gameState) finalState.walls = this.gameState.walls;
         this.gameState = finalState;
         this.render();
         
@@ -231,6 +231,10 @@ export class SnakeGame {
         this.prevState = this.gameState;
 
         if (!firstUpdate && this.gameState) {
+            // A new walls_version means a new map (e.g. the next duel round): redraw it
+            if (state.walls && state.walls_version !== this.gameState.walls_version) {
+                this.resetGraphicsCache();
+            }
             // Delta states omit static fields; carry them forward
             if (!state.walls && this.gameState.walls) state.walls = this.gameState.walls;
             if (!state.quadrant_bounds && this.gameState.quadrant_bounds) state.quadrant_bounds = this.gameState.quadrant_bounds;
@@ -260,6 +264,19 @@ export class SnakeGame {
         this.updateHUD();
     }
     
+    /**
+     * Server tick with no state change — keep particles animating
+     */
+    onTick() {
+        if (!this.gameState) return;
+        
+        if (this.particles) {
+            this.particles.update();
+        }
+        
+        this.render();
+    }
+    
     /**
      * Detect when players eat food
      */
@@ -1461,6 +1478,8 @@ export class SnakeGame {
      */
     onGameOver(winnerId, finalState, seriesScores = null) {
         this.running = false;
+        // The final state leaves out walls the client already holds
+        if (!finalState.walls && this.gameState) finalState.walls = this.gameState.walls;
         this.gameState = finalState;
         this.render();
         
@@ -6,6 +6,7 @@ import { NetworkManager } from './engine/NetworkManager.js';
 import { InputManager } from './engine/InputManager.js';
 import { Renderer } from './engine/Renderer.js';
 import { SoundManager } from './engine/SoundManager.js';
+import { StateDecoder } from './engine/StateDecoder.js';
 import { Menu } from './ui/Menu.js';
 import { Lobby } from './ui/Lobby.js';
 import { BrawlerLobby } from './ui/BrawlerLobby.js';
@@ -37,6 +38,7 @@ class App {
         this.network = new NetworkManager();
         this.input = new InputManager();
         this.sound = new SoundManager();
+        this.stateDecoder = new StateDecoder();
         this.renderer = null;
         this.menu = null;
         this.lobby = null;
@@ -257,6 +259,7 @@ class App {
                     this.game._deadOverlayShown = false;
                 }
                 this.hud.hideDeadOverlay();
+                this.stateDecoder.reset();
                 this.game.updateState(data.state);
                 if (!this.game.running) this.game.start();
             }
@@ -264,7 +267,13 @@ class App {
         
         this.network.on('game_state', (data) => {
             if (this.game) {
-                this.game.updateState(data.state);
+                this.game.updateState(this.stateDecoder.decode(data.state, this.game.gameState));
+            }
+        });
+        
+        this.network.on('game_tick', () => {
+            if (this.game && this.game.onTick) {
+                this.game.onTick();
             }
         });
         
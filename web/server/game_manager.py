@@ -6,17 +6,23 @@ import asyncio
 import random
 import time
 import math
-from collections import deque
+from array import array
+from itertools import count, islice
 from typing import Dict, Optional, List, Callable, Set, Tuple
 from dataclasses import dataclass
 
+import numpy as np
+
 from .models import (
     GameState, GameType, GameMode, Player, PlayerState, Snake, Food, Wall,
-    Position, Direction, QuadrantBounds, PLAYER_COLORS, get_random_food,
+    P, Direction, DIRECTION_FROM_NAME, QuadrantBounds, PLAYER_COLORS, get_random_food,
     BARRIER_CONFIGS, MAP_SIZES, TIME_LIMIT_OPTIONS, AI_DIFFICULTY_SETTINGS,
-    FOOD_HIT_RECOVERY
+    FOOD_HIT_RECOVERY, CELL_SHIFT, CELL_MASK, cell, cell_dict
 )
 from .room_manager import Room
+from .grid_kernels import (
+    HAVE_NUMBA, flood_fill_count, bfs_first_step, find_safe_spawn, warm_up as warm_up_kernels,
+)
 from .profiles import get_profile_manager
 
 
@@ -44,47 +50,207 @@ AI_NAMES = [
 ]
 
 
+# Quadrant layouts by player count: (x_min, x_max, y_min, y_max) in quadrant-size units
+_QUADRANT_LAYOUTS = {
+    1: ((0, 1, 0, 1),),
+    2: ((0, 1, 0, 1), (1, 2, 0, 1)),
+    3: ((0, 1, 0, 1), (1, 2, 0, 1), (0, 1, 1, 2)),
+    4: ((0, 1, 0, 1), (1, 2, 0, 1), (0, 1, 1, 2), (1, 2, 1, 2)),
+}
+
+# Step vector and reverse of each Direction, indexed by its int value
+_DIR_DXY = ((0, -1), (0, 1), (-1, 0), (1, 0))
+_OPPOSITE_IDX = (Direction.DOWN, Direction.UP, Direction.RIGHT, Direction.LEFT)
+# Order the spawn finders try facing directions in, with each step vector
+_SPAWN_DIRS = (
+    (Direction.RIGHT, 1, 0),
+    (Direction.LEFT, -1, 0),
+    (Direction.UP, 0, -1),
+    (Direction.DOWN, 0, 1),
+)
+
+
+# Source of GameState.walls_version, unique across games in this process
+_WALLS_VERSIONS = count(1)
+
+# Spawn order key for cells with no usable facing (see _spawn_masks_for)
+_NO_SPAWN = np.iinfo(np.int64).max
+
+# Game loop ticks (~1 s) between game_state frames that carry full snake bodies
+_KEYFRAME_TICKS = 30
+
+# Longest step update() will advance timers by (one move at the 100 ms base speed),
+# so a GC pause or stalled caller can't make spawn freezes and combos jump
+_MAX_TICK_DT = 0.1
+
+
+@dataclass
+class _AIBatch:
+    """Inputs to one AI decision batch, captured on the event loop so the worker thread
+    deciding it never touches state the loop can change while it waits."""
+    walks: Dict[int, Tuple[np.ndarray, bytearray]]  # quadrant -> own copy of its _ai_walkable mask
+    occ: np.ndarray  # copy of the occupancy grid, for the Numba kernels
+    foods: Dict[int, Tuple[List[Food], Tuple[np.ndarray, ...]]]  # quadrant -> (foods, _food_soa_for arrays)
+    draws: List[List[float]]  # per due AI: food-seeking roll, then a jitter draw per Direction
+    flood_memo: Dict[tuple, int]  # flood counts reused across the batch
+
+
+def _scale_uniform(u: float, low: int, high: int) -> int:
+    """Map a uniform draw in [0, 1) onto an integer in [low, high] (like randint)"""
+    return low + int(u * (high - low + 1))
+
+
 class GameManager:
     """Manages game state and logic for a single game instance"""
 
-    _DIR_VECTORS = {
-        Direction.UP: (0, -1),
-        Direction.DOWN: (0, 1),
-        Direction.LEFT: (-1, 0),
-        Direction.RIGHT: (1, 0),
-    }
-    _OPPOSITE = {
-        Direction.UP: Direction.DOWN,
-        Direction.DOWN: Direction.UP,
-        Direction.LEFT: Direction.RIGHT,
-        Direction.RIGHT: Direction.LEFT,
-    }
-
-    def __init__(self, room: Room, broadcast_callback: Callable):
+    def __init__(self, room: Room, broadcast_callback: Callable,
+                 broadcast_nowait: Optional[Callable] = None, seed: Optional[int] = None):
         self.room = room
         self.broadcast = broadcast_callback
+        # Non-blocking send for per-tick frames, called as broadcast_nowait(frame, resync)
+        # (see _resync_frame); falls back to awaiting broadcast
+        self.broadcast_nowait = broadcast_nowait
         self.state = GameState(
             game_type=room.game_type,
             mode=room.game_mode,
-            barrier_density=getattr(room, 'barrier_density', 'none')
+            barrier_density=room.barrier_density
         )
         self.game_task: Optional[asyncio.Task] = None
-        self.last_update = time.time()
+        self.last_update = time.monotonic()
+        # monotonic_ns() taken once at the start of each tick; AI reaction
+        # timing and death times within the tick all read this one timestamp
+        self._tick_ns = time.monotonic_ns()
 
         # Human players who voluntarily quit mid-game (survival mode).
         # Their absence is factored into alive_count checks for AI-only detection.
         self._mid_game_quit: Set[int] = set()
 
-        # Cache for wall positions (built once, used many times per tick)
-        self._wall_position_cache: Dict[int, Set[Tuple[int, int]]] = {}
-        # Per-tick shared blocked set for AI pathfinding (rebuilt each tick)
-        self._shared_blocked_cache: Dict[int, Set[Tuple[int, int]]] = {}
+        # Per-quadrant boolean wall grids for the map generation checks (see _get_wall_grid)
+        self._wall_grid_cache: Dict[int, np.ndarray] = {}
+
+        # Game-local RNGs: _rng for scalar draws, _np_rng for batched ones (whole
+        # arrays in one call). Passing a seed makes a synchronously set-up game repeatable.
+        self._rng = random.Random(seed)
+        self._np_rng = np.random.default_rng(seed)
+
+        # Board-wide occupancy grids, indexed by packed cell ((y << CELL_SHIFT) | x,
+        # the same key snake bodies use) and kept up to date incrementally. _occupancy
+        # counts walls + live snake segments per cell; _food_at maps each cell covered
+        # by food to that Food (None elsewhere).
+        self._stride = 1 << CELL_SHIFT  # row stride of the board grids
+        self._occupancy = bytearray()
+        self._occ_np = np.zeros(0, dtype=np.uint8)  # flat NumPy view of _occupancy for the kernels
+        self._wall_mask = b""  # walls only, same layout as _occupancy; fixed once walls are placed
+        self._wall_np = np.zeros(0, dtype=np.uint8)  # flat NumPy view of _wall_mask for the kernels
+        # quadrant -> (bounds it was built for, spawn masks), see _spawn_masks_for
+        self._spawn_masks: Dict[int, Tuple[Tuple[int, int, int, int], Optional[tuple]]] = {}
+        self._walls_serialized: Dict[int, List[dict]] = {}  # state.walls as sent to clients, see full_state
+        self._food_at: List[Optional[Food]] = []
+        # Scratch buffers for the pure-Python food BFS, sized once per game and reused every call
+        self._bfs_visited = bytearray()
+        self._bfs_clear = b""
+        self._bfs_queue: Tuple[array, array, array] = (array('i'), array('i'), array('i'))
+        # Per-quadrant SoA of food cells for AI targeting; dropped whenever that quadrant's foods change
+        self._food_soa: Dict[int, Tuple[np.ndarray, ...]] = {}
+
+        # Survival decay interval, cached until the next step-down time
+        self._current_decay_interval = 6.0
+        self._next_decay_change_at = 30.0
+
+        # Set whenever serialised state changes; the game loop only sends a full
+        # game_state frame when it is set, and a bare tick otherwise
+        self._dirty = True
+        self._tick = 0
+        # Frame numbering for body deltas: between keyframes a snake is sent as the
+        # head cells added since the previous frame plus its length
+        self._frame_no = 0
+        self._next_keyframe = 0
+        self._sent_moves: Dict[int, int] = {}
+        self._body_resets: Set[int] = set()
+        # Foods are left out of delta frames that follow a frame with no food change
+        self._foods_changed = True
+        self._players_list: List[Player] = []
+        # Live snakes by player id, in roster order; kept in step with alive_count
+        self._alive_players: Dict[int, Player] = {}
+        # The AI subset of _alive_players, for the per-tick decision scan
+        self._alive_ai: Dict[int, Player] = {}
+
+        # Per-tick mode dispatch, bound in setup_game once the final mode is known
+        self._update_mode: Optional[Callable[[float], None]] = None
+        self._is_battle_royale = False
+        self._tick_combos = False
+        # Speed-ramp step the current speed was last computed for
+        self._speed_intervals = 0
         
     def setup_game(self):
         """Initialize game state for all players"""
+        warm_up_kernels()
+        ai_count = self.room.ai_count
+        if self._is_simple_single_player(ai_count):
+            self._setup_single_player_fast()
+        else:
+            self._setup_layout(ai_count)
+            for quadrant, rng, np_rng in self._quadrant_rngs():
+                self._generate_walls(quadrant, rng, np_rng)
+            self._setup_players(ai_count)
+        self._apply_mode_settings()
+    
+    async def setup_game_async(self):
+        """setup_game for callers on the event loop.
+        Quadrants are independent, so their walls are generated concurrently
+        in worker threads instead of one after another on the loop."""
+        warm_up_kernels()
+        ai_count = self.room.ai_count
+        if self._is_simple_single_player(ai_count):
+            self._setup_single_player_fast()
+        else:
+            self._setup_layout(ai_count)
+            loop = asyncio.get_running_loop()
+            await asyncio.gather(*(
+                loop.run_in_executor(None, self._generate_walls, quadrant, rng, np_rng)
+                for quadrant, rng, np_rng in self._quadrant_rngs()
+            ))
+            self._setup_players(ai_count)
+        self._apply_mode_settings()
+    
+    def _quadrant_rngs(self) -> List[Tuple[int, random.Random, np.random.Generator]]:
+        """A (quadrant, rng, np_rng) pair of RNGs per quadrant, seeded in quadrant order
+        from the game RNG. Each wall job draws only from its own pair, so a seeded game
+        gets the same layout whether quadrants are generated in turn or concurrently."""
+        return [(quadrant, random.Random(self._rng.getrandbits(64)),
+                 np.random.default_rng(self._rng.getrandbits(64)))
+                for quadrant in self.state.quadrant_bounds]
+    
+    def _is_simple_single_player(self, ai_count: int) -> bool:
+        """Most common case: one human, no AI, no barriers — skips the general layout logic"""
+        return (len(self.room.players) == 1 and ai_count == 0
+                and self.state.barrier_density == 'none'
+                and self.state.mode in (GameMode.SURVIVAL, GameMode.SINGLE_PLAYER))
+    
+    def _setup_single_player_fast(self):
+        """Board and snake setup specialised for one human with no AI and no walls"""
+        self.state.mode = GameMode.SINGLE_PLAYER
+        map_size_key = self.room.map_size
+        map_config = MAP_SIZES.get(map_size_key, MAP_SIZES['medium'])
+        self.state.map_size = map_size_key
+        width = map_config['width']
+        height = map_config['height']
+        self.state.grid_width = self.state.quadrant_width = width
+        self.state.grid_height = self.state.quadrant_height = height
+        self.state.quadrant_bounds[0] = QuadrantBounds(0, width, 0, height)
+        self.state.walls[0] = []
+        self._reset_occupancy()
+        self._next_ai_id = -1
+        
+        player = next(iter(self.room.players.values()))
+        player.state = PlayerState.PLAYING
+        player.quadrant = 0
+        self.state.players[player.id] = player
+        self._setup_snake_for_player(player, 0)
+    
+    def _setup_layout(self, ai_count: int):
+        """Size the grid and quadrants for any mix of humans and AI (walls come next)"""
         num_human_players = len(self.room.players)
-        ai_count = getattr(self.room, 'ai_count', 0)
-        ai_difficulties = getattr(self.room, 'ai_difficulties', [])
         
         # Total players including AI
         total_players = num_human_players + ai_count
@@ -97,7 +263,7 @@ class GameManager:
         is_duel = self.state.mode == GameMode.DUEL
         
         # Get map size from room settings
-        map_size_key = getattr(self.room, 'map_size', 'medium')
+        map_size_key = self.room.map_size
         if is_battle_royale:
             if map_size_key == 'small':
                 map_size_key = 'large'
@@ -140,10 +306,18 @@ class GameManager:
         else:
             self._setup_quadrants(total_players if not is_single_player else 1)
         
-        # Generate walls for each quadrant based on barrier density
-        for quadrant in self.state.quadrant_bounds.keys():
+        # Walls for each quadrant are generated from these bounds by the caller
+        for quadrant in self.state.quadrant_bounds:
             self.state.walls[quadrant] = []
-            self._generate_walls(quadrant)
+    
+    def _setup_players(self, ai_count: int):
+        """Place human and AI snakes once the layout and walls exist"""
+        ai_difficulties = self.room.ai_difficulties
+        total_players = len(self.room.players) + ai_count
+        is_single_player = self.state.mode == GameMode.SINGLE_PLAYER and ai_count == 0
+        is_battle_royale = self.state.mode == GameMode.BATTLE_ROYALE
+        
+        self._reset_occupancy()
         
         # Track assigned quadrants
         used_quadrants = set()
@@ -163,15 +337,15 @@ class GameManager:
                 player.quadrant = self._get_next_quadrant(used_quadrants, total_players)
             
             used_quadrants.add(player.quadrant)
-            self._setup_snake_for_player(player, player_index, is_battle_royale)
+            self._setup_snake_for_player(player, player_index)
             player_index += 1
         
         # Create AI players — pick names without repetition (shuffle a copy of the pool)
         self._next_ai_id = -1  # AI players get negative IDs
-        _ai_name_pool = random.sample(AI_NAMES, min(ai_count, len(AI_NAMES)))
+        _ai_name_pool = self._rng.sample(AI_NAMES, min(ai_count, len(AI_NAMES)))
         # If we need more than the pool size, pad with more random picks
         while len(_ai_name_pool) < ai_count:
-            _ai_name_pool.append(random.choice(AI_NAMES))
+            _ai_name_pool.append(self._rng.choice(AI_NAMES))
         
         _difficulty_pool = ['amateur', 'semi_pro', 'pro', 'world_class']
         
@@ -186,9 +360,9 @@ class GameManager:
             if i < len(ai_difficulties) and ai_difficulties[i]:
                 per_ai_difficulty = ai_difficulties[i]
             else:
-                per_ai_difficulty = random.choice(_difficulty_pool)
+                per_ai_difficulty = self._rng.choice(_difficulty_pool)
             
-            ai_names_custom = self.room.ai_names if hasattr(self.room, 'ai_names') else []
+            ai_names_custom = self.room.ai_names
             raw_name = ai_names_custom[i] if i < len(ai_names_custom) and ai_names_custom[i].strip() else None
             ai_name = raw_name or _ai_name_pool[i]
             ai_player = Player(
@@ -199,21 +373,42 @@ class GameManager:
                 quadrant=ai_quadrant,
                 is_ai=True,
                 ai_difficulty=per_ai_difficulty,
-                ai_last_decision=time.time()
+                ai_last_decision=time.monotonic_ns()
             )
             self._next_ai_id -= 1
             
             self.state.players[ai_player.id] = ai_player
-            self._setup_snake_for_player(ai_player, player_index, is_battle_royale)
+            self._setup_snake_for_player(ai_player, player_index)
             player_index += 1
-        
-        self.state.alive_count = total_players
-        self.state.start_time = time.time()
+    
+    def _apply_mode_settings(self):
+        """Start the clock and apply mode-specific settings once all snakes are placed"""
+        # The roster is fixed once the game starts, so per-tick loops walk a plain list
+        self._players_list = list(self.state.players.values())
+        self._alive_players = {p.id: p for p in self._players_list}
+        self._alive_ai = {p.id: p for p in self._players_list if p.is_ai}
+        self.state.alive_count = len(self._players_list)
+        self.state.start_time = time.monotonic()
         self.state.running = True
         
+        self._update_mode = {
+            GameMode.SURVIVAL: self._update_survival,
+            GameMode.HIGH_SCORE: self._update_high_score,
+            GameMode.BATTLE_ROYALE: self._update_battle_royale,
+            GameMode.DUEL: self._update_duel,
+            # Single player has no per-tick work: its speed follows the score (see _move_snake)
+        }.get(self.state.mode)
+        self._is_battle_royale = self.state.mode == GameMode.BATTLE_ROYALE
+        self._tick_combos = self.state.mode in (
+            GameMode.HIGH_SCORE, GameMode.BATTLE_ROYALE, GameMode.SINGLE_PLAYER
+        )
+        
         # Always reset speed to base to prevent carryover across games
         self.state.current_speed = self.state.base_speed
+        self._speed_intervals = 0
         self.state.elapsed_time = 0
+        # Clients get the new bodies in game_start; resync deltas from a keyframe
+        self._next_keyframe = 0
         
         # Apply initial spawn freeze to ALL snakes (1 second orientation period)
         for player in self.state.players.values():
@@ -225,6 +420,7 @@ class GameManager:
             self.state.next_shrink_time = self.state.shrink_interval
             self.state.survival_speed_next_increase = self.state.survival_speed_increase_interval
             self.state.survival_decay_current_interval = 6.0
+            self._current_decay_interval, self._next_decay_change_at = self._get_survival_decay_interval()
             # Give every snake a full initial decay interval
             for player in self.state.players.values():
                 if player.snake:
@@ -238,7 +434,7 @@ class GameManager:
             time_option = TIME_LIMIT_OPTIONS.get(self.room.time_limit, TIME_LIMIT_OPTIONS["1m"])
             self.state.time_limit = time_option["seconds"]
             # Spawn extra food (3-4 items)
-            extra_food = random.randint(1, 2)  # Already spawned 2, add 1-2 more
+            extra_food = self._rng.randint(1, 2)  # Already spawned 2, add 1-2 more
             for _ in range(extra_food):
                 self._spawn_food(0)
         elif self.state.mode == GameMode.DUEL:
@@ -251,7 +447,7 @@ class GameManager:
             self.state.next_shrink_time = 20  # Shrink sooner in duel
             self.state.shrink_interval = 20
             # Series state
-            self.state.series_length = getattr(self.room, 'series_length', 3)
+            self.state.series_length = self.room.series_length
             if not self.state.series_scores:
                 for pid in self.state.players:
                     self.state.series_scores[pid] = 0
@@ -268,36 +464,13 @@ class GameManager:
                 return q
         return 0
     
-    def _setup_snake_for_player(self, player: Player, player_index: int, is_battle_royale: bool = False):
+    def _setup_snake_for_player(self, player: Player, player_index: int):
         """Setup snake for a player in their quadrant"""
-        # Create snake in player's quadrant with safe spawn position
-        wall_positions = self._get_wall_positions(player.quadrant)
-        
-        # For Battle Royale, we need to avoid other snakes too
-        if is_battle_royale:
-            start_x, start_y, direction = self._find_safe_spawn_battle_royale(
-                player.quadrant, wall_positions, player.id
-            )
-        else:
-            start_x, start_y, direction = self._find_safe_spawn(player.quadrant, wall_positions)
-        
-        # Get direction vector for body placement (body is behind head)
-        dir_vectors = {
-            Direction.RIGHT: (1, 0),
-            Direction.LEFT: (-1, 0),
-            Direction.UP: (0, -1),
-            Direction.DOWN: (0, 1)
-        }
-        vx, vy = dir_vectors[direction]
-        
-        snake = Snake(
+        player.snake = Snake(
             player_id=player.id,
-            body=[Position(start_x - vx * j, start_y - vy * j) for j in range(3)],
-            direction=direction,
-            next_direction=direction,
             color=PLAYER_COLORS[player_index % len(PLAYER_COLORS)]
         )
-        player.snake = snake
+        self._place_snake(player)
         
         # Spawn initial food in quadrant if not already done
         if player.quadrant not in self.state.foods:
@@ -305,8 +478,9 @@ class GameManager:
             self._spawn_food(player.quadrant)
             self._spawn_food(player.quadrant)  # Spawn 2 food items initially
     
-    def _generate_walls(self, quadrant: int):
-        """Generate walls in a quadrant based on barrier density"""
+    def _generate_walls(self, quadrant: int, rng: random.Random, np_rng: np.random.Generator):
+        """Generate walls in a quadrant based on barrier density, drawing only from
+        the quadrant's own RNGs (see _quadrant_rngs)"""
         bounds = self.state.quadrant_bounds.get(quadrant)
         if not bounds:
             return
@@ -320,21 +494,27 @@ class GameManager:
         # Try to generate walls with connectivity, retry if needed
         max_attempts = 5
         for attempt in range(max_attempts):
-            walls = self._generate_walls_random(quadrant, bounds, wall_count)
+            walls = self._generate_walls_random(quadrant, bounds, wall_count, rng, np_rng)
             self.state.walls[quadrant] = walls
             
             # Clear wall cache before checking connectivity
             self._invalidate_wall_cache(quadrant)
             
+            # A handful of cells (under 5% of the quadrant) cannot cut it off — skip the BFS
+            wall_cells = sum(w.width * w.height for w in walls)
+            if wall_cells < 0.05 * (bounds.x_max - bounds.x_min) * (bounds.y_max - bounds.y_min):
+                return
+            
             # Check if spawn area is still reachable
             if self._check_wall_connectivity(quadrant, bounds):
                 return
         
         # If all attempts fail, fall back to sparse pattern
-        self.state.walls[quadrant] = self._generate_sparse_walls(bounds, max(2, wall_count // 2))
+        self.state.walls[quadrant] = self._generate_sparse_walls(bounds, max(2, wall_count // 2), np_rng)
         self._invalidate_wall_cache(quadrant)
     
-    def _generate_walls_random(self, quadrant: int, bounds: QuadrantBounds, wall_count: int) -> List[Wall]:
+    def _generate_walls_random(self, quadrant: int, bounds: QuadrantBounds, wall_count: int,
+                               rng: random.Random, np_rng: np.random.Generator) -> List[Wall]:
         """Generate random walls based on density level"""
         walls = []
         width = bounds.x_max - bounds.x_min
@@ -346,7 +526,7 @@ class GameManager:
         safe_zone = (center_x - 3, center_y - 3, center_x + 3, center_y + 3)
         
         if self.state.barrier_density == "sparse":
-            walls = self._generate_sparse_walls(bounds, wall_count)
+            walls = self._generate_sparse_walls(bounds, wall_count, np_rng)
         
         elif self.state.barrier_density == "moderate":
             # Random medium-sized obstacles scattered around
@@ -354,28 +534,41 @@ class GameManager:
             attempts = 0
             target_walls = wall_count
             
-            while len(placed_walls) < target_walls and attempts < target_walls * 10:
+            # Draw every random number the placement loop can need up front
+            max_tries = target_walls * 10
+            sizes_w = np_rng.integers(2, 5, size=max_tries).tolist()
+            sizes_h = np_rng.integers(1, 4, size=max_tries).tolist()
+            swaps = (np_rng.random(max_tries) > 0.6).tolist()
+            pos_u = np_rng.random((max_tries, 2)).tolist()
+            
+            # Cells covered by placed walls, so an overlap test is one grid slice
+            # whatever the number of walls placed so far
+            claimed = np.zeros((height, width), dtype=np.bool_)
+            
+            while len(placed_walls) < target_walls and attempts < max_tries:
+                i = attempts
                 attempts += 1
                 
                 # Random wall size
-                w = random.randint(2, 4)
-                h = random.randint(1, 3)
-                if random.random() > 0.6:
+                w = sizes_w[i]
+                h = sizes_h[i]
+                if swaps[i]:
                     w, h = h, w  # Swap for variety
                 
                 # Random position (avoid edges and spawn zone)
-                x = random.randint(bounds.x_min + 2, bounds.x_max - w - 2)
-                y = random.randint(bounds.y_min + 2, bounds.y_max - h - 2)
+                x = _scale_uniform(pos_u[i][0], bounds.x_min + 2, bounds.x_max - w - 2)
+                y = _scale_uniform(pos_u[i][1], bounds.y_min + 2, bounds.y_max - h - 2)
                 
                 # Check spawn zone
                 if self._wall_overlaps_zone(x, y, w, h, safe_zone):
                     continue
                 
                 # Check overlap with existing walls (with margin)
-                if self._wall_overlaps_existing(x, y, w, h, placed_walls, margin=2):
+                if self._wall_overlaps_existing(x, y, w, h, claimed, bounds, margin=2):
                     continue
                 
-                placed_walls.append(Wall(Position(x, y), w, h))
+                claimed[y - bounds.y_min:y - bounds.y_min + h, x - bounds.x_min:x - bounds.x_min + w] = True
+                placed_walls.append(Wall(P(x, y), w, h))
             
             walls = placed_walls
         
@@ -383,75 +576,82 @@ class GameManager:
             # Random maze-like pattern with lines and blocks
             
             # Random number of horizontal lines (2-4)
-            num_h_lines = random.randint(2, 4)
+            num_h_lines = rng.randint(2, 4)
             h_spacing = (height - 6) // (num_h_lines + 1)
             
             for i in range(num_h_lines):
-                y_offset = random.randint(-1, 1)  # Add randomness to position
+                y_offset = rng.randint(-1, 1)  # Add randomness to position
                 y = bounds.y_min + 3 + (i + 1) * h_spacing + y_offset
                 if bounds.y_min + 3 < y < bounds.y_max - 3:
                     # Random gap position and size
-                    gap_size = random.randint(3, 5)
-                    gap_start = random.randint(bounds.x_min + 4, bounds.x_max - gap_size - 4)
+                    gap_size = rng.randint(3, 5)
+                    gap_start = rng.randint(bounds.x_min + 4, bounds.x_max - gap_size - 4)
                     
                     # Left segment
                     left_len = gap_start - bounds.x_min - 2
                     if left_len >= 2:
-                        walls.append(Wall(Position(bounds.x_min + 2, y), left_len, 1))
+                        walls.append(Wall(P(bounds.x_min + 2, y), left_len, 1))
                     
                     # Right segment  
                     right_start = gap_start + gap_size
                     right_len = bounds.x_max - right_start - 2
                     if right_len >= 2:
-                        walls.append(Wall(Position(right_start, y), right_len, 1))
+                        walls.append(Wall(P(right_start, y), right_len, 1))
             
             # Random number of vertical lines (1-3)
-            num_v_lines = random.randint(1, 3)
+            num_v_lines = rng.randint(1, 3)
             v_spacing = (width - 6) // (num_v_lines + 1)
             
             for i in range(num_v_lines):
-                x_offset = random.randint(-1, 1)
+                x_offset = rng.randint(-1, 1)
                 x = bounds.x_min + 3 + (i + 1) * v_spacing + x_offset
                 if bounds.x_min + 3 < x < bounds.x_max - 3:
-                    gap_size = random.randint(3, 5)
-                    gap_start = random.randint(bounds.y_min + 4, bounds.y_max - gap_size - 4)
+                    gap_size = rng.randint(3, 5)
+                    gap_start = rng.randint(bounds.y_min + 4, bounds.y_max - gap_size - 4)
                     
                     # Top segment
                     top_len = gap_start - bounds.y_min - 2
                     if top_len >= 2:
-                        walls.append(Wall(Position(x, bounds.y_min + 2), 1, top_len))
+                        walls.append(Wall(P(x, bounds.y_min + 2), 1, top_len))
                     
                     # Bottom segment
                     bottom_start = gap_start + gap_size
                     bottom_len = bounds.y_max - bottom_start - 2
                     if bottom_len >= 2:
-                        walls.append(Wall(Position(x, bottom_start), 1, bottom_len))
+                        walls.append(Wall(P(x, bottom_start), 1, bottom_len))
             
             # Add a few random blocks for variety
-            num_blocks = random.randint(1, 3)
+            num_blocks = rng.randint(1, 3)
             for _ in range(num_blocks):
-                w = random.randint(2, 3)
-                h = random.randint(2, 3)
-                x = random.randint(bounds.x_min + 3, bounds.x_max - w - 3)
-                y = random.randint(bounds.y_min + 3, bounds.y_max - h - 3)
+                w = rng.randint(2, 3)
+                h = rng.randint(2, 3)
+                x = rng.randint(bounds.x_min + 3, bounds.x_max - w - 3)
+                y = rng.randint(bounds.y_min + 3, bounds.y_max - h - 3)
                 
                 if not self._wall_overlaps_zone(x, y, w, h, safe_zone):
-                    walls.append(Wall(Position(x, y), w, h))
+                    walls.append(Wall(P(x, y), w, h))
         
         return walls
     
-    def _generate_sparse_walls(self, bounds: QuadrantBounds, wall_count: int) -> List[Wall]:
+    def _generate_sparse_walls(self, bounds: QuadrantBounds, wall_count: int,
+                               rng: np.random.Generator) -> List[Wall]:
         """Generate sparse random walls"""
+        sizes_w = rng.integers(2, 5, size=wall_count).tolist()
+        tall = (rng.random(wall_count) <= 0.3).tolist()
+        sizes_h = rng.integers(1, 3, size=wall_count).tolist()
+        swaps = (rng.random(wall_count) > 0.5).tolist()
+        pos_u = rng.random((wall_count, 2)).tolist()
+        
         walls = []
-        for _ in range(wall_count):
-            w = random.randint(2, 4)
-            h = 1 if random.random() > 0.3 else random.randint(1, 2)
-            if random.random() > 0.5:
+        for i in range(wall_count):
+            w = sizes_w[i]
+            h = sizes_h[i] if tall[i] else 1
+            if swaps[i]:
                 w, h = h, w
             
-            x = random.randint(bounds.x_min + 3, bounds.x_max - w - 3)
-            y = random.randint(bounds.y_min + 3, bounds.y_max - h - 3)
-            walls.append(Wall(Position(x, y), w, h))
+            x = _scale_uniform(pos_u[i][0], bounds.x_min + 3, bounds.x_max - w - 3)
+            y = _scale_uniform(pos_u[i][1], bounds.y_min + 3, bounds.y_max - h - 3)
+            walls.append(Wall(P(x, y), w, h))
         return walls
     
     def _wall_overlaps_zone(self, x: int, y: int, w: int, h: int, 
@@ -460,69 +660,134 @@ class GameManager:
         zone_x1, zone_y1, zone_x2, zone_y2 = zone
         return not (x + w <= zone_x1 or x >= zone_x2 or y + h <= zone_y1 or y >= zone_y2)
     
-    def _wall_overlaps_existing(self, x: int, y: int, w: int, h: int, 
-                                 existing: List[Wall], margin: int = 0) -> bool:
-        """Check if a wall overlaps with existing walls (with optional margin)"""
-        for wall in existing:
-            wx, wy = wall.position.x, wall.position.y
-            ww, wh = wall.width, wall.height
-            
-            # Check overlap with margin
-            if not (x + w + margin <= wx or x >= wx + ww + margin or 
-                    y + h + margin <= wy or y >= wy + wh + margin):
-                return True
-        return False
+    def _wall_overlaps_existing(self, x: int, y: int, w: int, h: int, claimed: np.ndarray,
+                                 bounds: QuadrantBounds, margin: int = 0) -> bool:
+        """Check if a wall overlaps with existing walls (with optional margin).
+        
+        claimed is the quadrant's (height, width) grid with every placed wall's cells
+        set, so only the cells within margin of the candidate need checking.
+        """
+        col = x - bounds.x_min
+        row = y - bounds.y_min
+        return bool(claimed[max(0, row - margin):row + h + margin,
+                            max(0, col - margin):col + w + margin].any())
     
     def _check_wall_connectivity(self, quadrant: int, bounds: QuadrantBounds) -> bool:
         """Check if spawn area is connected to rest of map (can reach edges)"""
         center_x = (bounds.x_min + bounds.x_max) // 2
         center_y = (bounds.y_min + bounds.y_max) // 2
         
-        wall_positions = self._get_wall_positions(quadrant)
-        
-        # Flood-fill from center to check we can reach sufficient area
-        visited = set()
-        queue = [(center_x, center_y)]
-        
-        while queue:
-            x, y = queue.pop(0)
-            
-            if (x, y) in visited:
-                continue
-            if not (bounds.x_min <= x < bounds.x_max and bounds.y_min <= y < bounds.y_max):
-                continue
-            if (x, y) in wall_positions:
-                continue
-            
-            visited.add((x, y))
-            
-            for dx, dy in [(0, -1), (0, 1), (-1, 0), (1, 0)]:
-                queue.append((x + dx, y + dy))
-        
-        # Check we can reach at least 50% of the map
-        total_cells = (bounds.x_max - bounds.x_min) * (bounds.y_max - bounds.y_min)
-        required_cells = total_cells * 0.5
-        
-        return len(visited) >= required_cells
+        grid = self._get_wall_grid(quadrant)
+        height, width = grid.shape
+        
+        # Flood-fill from center to check we can reach at least 50% of the map,
+        # stopping as soon as that many cells are reached
+        required_cells = (height * width + 1) // 2
+        start_col, start_row = center_x - bounds.x_min, center_y - bounds.y_min
+        if HAVE_NUMBA:
+            reached = flood_fill_count(grid.view(np.uint8).ravel(), width, 0, width, 0, height,
+                                       start_col, start_row, width * height, required_cells)
+            return reached >= required_cells
+        
+        # Without Numba: flood the quadrant as one big-int bitset, a row of width + 1 bits
+        # per grid row. The extra guard bit is never free, so a one-bit shift can't wrap
+        # from one row into the next. Each pass grows the reached set one step in every
+        # direction at once, until it stops growing.
+        stride = width + 1
+        padded = np.zeros((height, stride), dtype=np.bool_)
+        padded[:, :width] = ~grid
+        free = int.from_bytes(np.packbits(padded, bitorder='little').tobytes(), 'little')
+        start = start_row * stride + start_col
+        reach = (1 << start) & free
+        while reach:
+            if reach.bit_count() >= required_cells:
+                return True
+            grown = (reach | (reach << 1) | (reach >> 1) | (reach << stride) | (reach >> stride)) & free
+            if grown == reach:
+                break
+            reach = grown
+        return False
     
-    def _get_wall_positions(self, quadrant: int) -> Set[Tuple[int, int]]:
-        """Get all positions occupied by walls in a quadrant (cached for performance)"""
-        if quadrant not in self._wall_position_cache:
-            positions = set()
+    def _get_wall_grid(self, quadrant: int) -> np.ndarray:
+        """Boolean (height, width) grid of the walls in a quadrant, indexed
+        [y - y_min, x - x_min] (cached for performance)"""
+        grid = self._wall_grid_cache.get(quadrant)
+        if grid is None:
+            bounds = self.state.quadrant_bounds[quadrant]
+            grid = np.zeros((bounds.y_max - bounds.y_min, bounds.x_max - bounds.x_min), dtype=np.bool_)
             for wall in self.state.walls.get(quadrant, []):
-                for pos in wall.get_all_positions():
-                    positions.add((pos.x, pos.y))
-            self._wall_position_cache[quadrant] = positions
-        return self._wall_position_cache[quadrant]
+                x0 = max(0, wall.position.x - bounds.x_min)
+                y0 = max(0, wall.position.y - bounds.y_min)
+                grid[y0:wall.position.y - bounds.y_min + wall.height,
+                     x0:wall.position.x - bounds.x_min + wall.width] = True
+            self._wall_grid_cache[quadrant] = grid
+        return grid
     
     def _invalidate_wall_cache(self, quadrant: int = None):
         """Invalidate wall position cache (call when walls change)"""
         if quadrant is not None:
-            self._wall_position_cache.pop(quadrant, None)
+            self._wall_grid_cache.pop(quadrant, None)
+        else:
+            self._wall_grid_cache.clear()
+    
+    def _reset_occupancy(self):
+        """Allocate empty occupancy grids for the board and bake in the walls"""
+        stride = self._stride
+        if self.state.grid_width > stride:
+            raise ValueError(f"grid width {self.state.grid_width} exceeds packed cell range {stride}")
+        cells = stride * self.state.grid_height
+        self._occupancy = bytearray(cells)
+        self._occ_np = np.frombuffer(self._occupancy, dtype=np.uint8)
+        self._food_at = [None] * cells
+        # Big enough for the padded walkable mask of any quadrant (see _ai_walkable)
+        padded = (self.state.grid_width + 2) * (self.state.grid_height + 2)
+        self._bfs_visited = bytearray(padded)
+        self._bfs_clear = bytes(padded)
+        self._bfs_queue = (array('i', [0]) * padded, array('i', [0]) * padded, array('i', [0]) * padded)
+        self._food_soa = {}
+        # Walls are axis-aligned rectangles: stamp each footprint with one slice
+        # assignment through a 2-D NumPy view
+        occupancy = self._occ_np.reshape(-1, stride)
+        for walls in self.state.walls.values():
+            for wall in walls:
+                x, y = wall.position.x, wall.position.y
+                occupancy[y:y + wall.height, x:x + wall.width] = 1
+        self._wall_mask = bytes(self._occupancy)
+        self._wall_np = np.frombuffer(self._wall_mask, dtype=np.uint8)
+        self._spawn_masks = {}
+        # Walls are fixed from here on: serialise them once for every full-state message
+        self._walls_serialized = {q: [w.to_dict() for w in walls] for q, walls in self.state.walls.items()}
+        self.state.walls_version = next(_WALLS_VERSIONS)
+    
+    def _mark(self, c: int):
+        """Record a snake segment entering a cell"""
+        self._occupancy[c] += 1
+    
+    def _unmark(self, c: int):
+        """Record a snake segment leaving a cell"""
+        self._occupancy[c] -= 1
+    
+    def _push_head(self, snake: Snake, c: int):
+        """Grow a snake at the head, keeping body_cells and occupancy in step"""
+        snake.body.appendleft(c)
+        snake.moves += 1
+        cells = snake.body_cells
+        cells[c] = cells.get(c, 0) + 1
+        self._occupancy[c] += 1
+    
+    def _pop_tail(self, snake: Snake) -> int:
+        """Drop a snake's last segment, keeping body_cells and occupancy in step"""
+        tail = snake.body.pop()
+        cells = snake.body_cells
+        remaining = cells[tail] - 1
+        if remaining:
+            cells[tail] = remaining
         else:
-            self._wall_position_cache.clear()
+            del cells[tail]
+        self._occupancy[tail] -= 1
+        return tail
     
-    def _find_safe_spawn(self, quadrant: int, wall_positions: Set[Tuple[int, int]]) -> Tuple[int, int, Direction]:
+    def _find_safe_spawn(self, quadrant: int) -> Tuple[int, int, Direction]:
         """Find a safe spawn position and direction with no walls within 3 spaces ahead"""
         bounds = self.state.quadrant_bounds.get(quadrant)
         if not bounds:
@@ -532,145 +797,109 @@ class GameManager:
         center_x = (bounds.x_min + bounds.x_max) // 2
         center_y = (bounds.y_min + bounds.y_max) // 2
         
-        # Direction vectors for checking ahead
-        direction_vectors = {
-            Direction.RIGHT: (1, 0),
-            Direction.LEFT: (-1, 0),
-            Direction.UP: (0, -1),
-            Direction.DOWN: (0, 1)
-        }
-        
-        # Try positions in a spiral pattern from center
-        for offset in range(0, max(bounds.x_max - bounds.x_min, bounds.y_max - bounds.y_min)):
-            for dx in range(-offset, offset + 1):
-                for dy in range(-offset, offset + 1):
-                    if abs(dx) != offset and abs(dy) != offset:
-                        continue  # Only check perimeter of spiral
-                    
-                    test_x = center_x + dx
-                    test_y = center_y + dy
-                    
-                    # Check bounds (need space for snake body behind)
-                    if test_x < bounds.x_min + 4 or test_x > bounds.x_max - 4:
-                        continue
-                    if test_y < bounds.y_min + 4 or test_y > bounds.y_max - 4:
-                        continue
-                    
-                    # Try each direction
-                    for direction, (vx, vy) in direction_vectors.items():
-                        # Check if snake body positions are clear
-                        body_clear = True
-                        for j in range(3):
-                            body_x = test_x - vx * j
-                            body_y = test_y - vy * j
-                            if (body_x, body_y) in wall_positions:
-                                body_clear = False
-                                break
-                        
-                        if not body_clear:
-                            continue
-                        
-                        # Check 3 spaces ahead of head
-                        ahead_clear = True
-                        for i in range(1, 4):
-                            ahead_x = test_x + vx * i
-                            ahead_y = test_y + vy * i
-                            if (ahead_x, ahead_y) in wall_positions:
-                                ahead_clear = False
-                                break
-                        
-                        if ahead_clear:
-                            return (test_x, test_y, direction)
+        if HAVE_NUMBA:
+            x, y, d = find_safe_spawn(self._wall_np, self._stride, bounds.x_min, bounds.x_max,
+                                      bounds.y_min, bounds.y_max)
+            if d >= 0:
+                return (int(x), int(y), Direction(d))
+            return (center_x, center_y, Direction.RIGHT)
+        
+        masks = self._spawn_masks_for(quadrant, bounds)
+        if masks is not None:
+            x0, y0, clear, order = masks
+            best = int(np.argmin(order))
+            if order.flat[best] != _NO_SPAWN:
+                # Nearest usable head in spiral order, facing the first clear direction
+                row, col = divmod(best, order.shape[1])
+                direction = _SPAWN_DIRS[int(np.argmax(clear[:, row, col]))][0]
+                return (x0 + col, y0 + row, direction)
         
         # Fallback to center facing right (shouldn't happen with reasonable maps)
         return (center_x, center_y, Direction.RIGHT)
-
-    def _find_safe_spawn_battle_royale(self, quadrant: int, wall_positions: Set[Tuple[int, int]],
-                                        exclude_player_id: int) -> Tuple[int, int, Direction]:
+    
+    def _spawn_masks_for(self, quadrant: int, bounds: QuadrantBounds):
+        """Per-direction spawn masks for a quadrant, built once from the static walls.
+        
+        Returns (x0, y0, clear, order) over the head area [x0, x1] x [y0, y1]:
+        clear[d] marks heads whose body (2 behind) and 3 cells ahead are wall-free
+        facing _SPAWN_DIRS[d], and order ranks usable heads in the centre-out spiral
+        order (ring, then dx, then dy; _NO_SPAWN elsewhere). None if the quadrant is
+        too small to hold a head. Rebuilt if the bounds have changed since.
+        """
+        key = (bounds.x_min, bounds.x_max, bounds.y_min, bounds.y_max)
+        cached = self._spawn_masks.get(quadrant)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        
+        x0, x1 = bounds.x_min + 4, bounds.x_max - 4
+        y0, y1 = bounds.y_min + 4, bounds.y_max - 4
+        masks = None
+        if x1 >= x0 and y1 >= y0:
+            walls = self._wall_np.view(np.bool_).reshape(-1, self._stride)
+            
+            def blocked(lo: int, hi: int, horizontal: bool) -> np.ndarray:
+                # OR of the wall grid shifted by lo..hi cells along one axis
+                acc = np.zeros((y1 - y0 + 1, x1 - x0 + 1), dtype=np.bool_)
+                for k in range(lo, hi + 1):
+                    if horizontal:
+                        acc |= walls[y0:y1 + 1, x0 + k:x1 + 1 + k]
+                    else:
+                        acc |= walls[y0 + k:y1 + 1 + k, x0:x1 + 1]
+                return acc
+            
+            clear = ~np.stack((blocked(-2, 3, True), blocked(-3, 2, True),
+                               blocked(-3, 2, False), blocked(-2, 3, False)))
+            center_x = (bounds.x_min + bounds.x_max) // 2
+            center_y = (bounds.y_min + bounds.y_max) // 2
+            dy = np.arange(y0 - center_y, y1 + 1 - center_y, dtype=np.int64)[:, None]
+            dx = np.arange(x0 - center_x, x1 + 1 - center_x, dtype=np.int64)[None, :]
+            ring = np.maximum(np.abs(dx), np.abs(dy))
+            order = np.where(clear.any(axis=0), (ring * 1024 + dx + 512) * 1024 + dy + 512, _NO_SPAWN)
+            masks = (x0, y0, clear, order)
+        self._spawn_masks[quadrant] = (key, masks)
+        return masks
+
+    def _find_safe_spawn_battle_royale(self, quadrant: int) -> Tuple[int, int, Direction]:
         """Find a safe spawn in Battle Royale mode, avoiding walls AND other snakes."""
         bounds = self.state.quadrant_bounds.get(quadrant)
         if not bounds:
             return (0, 0, Direction.RIGHT)
         
-        # Build set of all snake body positions (excluding the player being spawned)
-        snake_positions = set()
-        for p in self.state.players.values():
-            if p.id != exclude_player_id and p.snake and p.snake.body:
-                for pos in p.snake.body:
-                    snake_positions.add((pos.x, pos.y))
-        
-        blocked = wall_positions | snake_positions
-        
-        direction_vectors = {
-            Direction.RIGHT: (1, 0),
-            Direction.LEFT: (-1, 0),
-            Direction.UP: (0, -1),
-            Direction.DOWN: (0, 1)
-        }
+        # The occupancy grid holds walls and every live snake body (a dead snake,
+        # including the one being respawned, has already been lifted off it)
+        occupancy = self._occupancy
         
         # Try random positions across the map to spread players out
-        width = bounds.x_max - bounds.x_min
-        height = bounds.y_max - bounds.y_min
         attempts = 0
         max_attempts = 200
         
         while attempts < max_attempts:
             attempts += 1
-            test_x = random.randint(bounds.x_min + 4, bounds.x_max - 5)
-            test_y = random.randint(bounds.y_min + 4, bounds.y_max - 5)
+            test_x = self._rng.randint(bounds.x_min + 4, bounds.x_max - 5)
+            test_y = self._rng.randint(bounds.y_min + 4, bounds.y_max - 5)
+            head = cell(test_x, test_y)
             
             # Try each direction from this position
-            for direction, (vx, vy) in direction_vectors.items():
-                # Check if snake body positions would be clear
-                body_clear = True
-                for j in range(3):
-                    body_x = test_x - vx * j
-                    body_y = test_y - vy * j
-                    if (body_x, body_y) in blocked:
-                        body_clear = False
-                        break
-                
-                if not body_clear:
+            for direction, vx, vy in _SPAWN_DIRS:
+                # The 3 spaces ahead must stay inside the quadrant
+                if not (bounds.x_min <= test_x + 3 * vx < bounds.x_max and
+                        bounds.y_min <= test_y + 3 * vy < bounds.y_max):
                     continue
-                
-                # Check 3 spaces ahead of head are clear
-                ahead_clear = True
-                for i in range(1, 4):
-                    ahead_x = test_x + vx * i
-                    ahead_y = test_y + vy * i
-                    if (ahead_x, ahead_y) in blocked:
-                        ahead_clear = False
-                        break
-                    if not (bounds.x_min <= ahead_x < bounds.x_max and
-                            bounds.y_min <= ahead_y < bounds.y_max):
-                        ahead_clear = False
-                        break
-                
-                if ahead_clear:
+                step = (vy << CELL_SHIFT) + vx
+                # Snake body (head and 2 behind) and 3 spaces ahead of head must be clear
+                if not any(occupancy[head + step * k] for k in range(-2, 4)):
                     return (test_x, test_y, direction)
         
         # Fallback to regular spawn if we couldn't find a clear spot
-        return self._find_safe_spawn(quadrant, wall_positions)
+        return self._find_safe_spawn(quadrant)
 
     def _setup_quadrants(self, num_players: int):
         """Setup quadrant bounds based on player count"""
         w = self.state.quadrant_width
         h = self.state.quadrant_height
-        
-        if num_players == 1:
-            self.state.quadrant_bounds[0] = QuadrantBounds(0, w, 0, h)
-        elif num_players == 2:
-            self.state.quadrant_bounds[0] = QuadrantBounds(0, w, 0, h)
-            self.state.quadrant_bounds[1] = QuadrantBounds(w, w * 2, 0, h)
-        elif num_players == 3:
-            self.state.quadrant_bounds[0] = QuadrantBounds(0, w, 0, h)
-            self.state.quadrant_bounds[1] = QuadrantBounds(w, w * 2, 0, h)
-            self.state.quadrant_bounds[2] = QuadrantBounds(0, w, h, h * 2)
-        else:  # 4 players
-            self.state.quadrant_bounds[0] = QuadrantBounds(0, w, 0, h)
-            self.state.quadrant_bounds[1] = QuadrantBounds(w, w * 2, 0, h)
-            self.state.quadrant_bounds[2] = QuadrantBounds(0, w, h, h * 2)
-            self.state.quadrant_bounds[3] = QuadrantBounds(w, w * 2, h, h * 2)
+        layout = _QUADRANT_LAYOUTS.get(num_players, _QUADRANT_LAYOUTS[4])
+        for q, (x0, x1, y0, y1) in enumerate(layout):
+            self.state.quadrant_bounds[q] = QuadrantBounds(x0 * w, x1 * w, y0 * h, y1 * h)
     
     def _spawn_food(self, quadrant: int):
         """Spawn food in a quadrant"""
@@ -678,27 +907,15 @@ class GameManager:
         if not bounds:
             return
         
-        # Get positions occupied by snake
-        occupied = set()
-        for player in self.state.players.values():
-            if player.snake and player.quadrant == quadrant:
-                for pos in player.snake.body:
-                    occupied.add((pos.x, pos.y))
-        
-        # Also exclude existing food (all cells of multi-cell food)
-        for food in self.state.foods.get(quadrant, []):
-            for pos in food.get_all_positions():
-                occupied.add((pos.x, pos.y))
-        
-        # Exclude walls
-        wall_positions = self._get_wall_positions(quadrant)
-        occupied.update(wall_positions)
+        occupancy = self._occupancy
+        food_at = self._food_at
+        stride = self._stride
         
         # Find valid position for multi-cell food
         attempts = 0
         while attempts < 100:
             try:
-                food_data = get_random_food()
+                food_data = get_random_food(self._rng)
                 cells = food_data.get("cells", [(0, 0)])
                 
                 # Calculate required space
@@ -717,8 +934,8 @@ class GameManager:
                     continue
                 
                 # Ensure food fits within bounds
-                x = random.randint(x_min_bound, x_max_bound)
-                y = random.randint(y_min_bound, y_max_bound)
+                x = self._rng.randint(x_min_bound, x_max_bound)
+                y = self._rng.randint(y_min_bound, y_max_bound)
             except Exception:
                 attempts += 1
                 continue
@@ -726,13 +943,25 @@ class GameManager:
             # Check all cells are free
             all_free = True
             for dx, dy in cells:
-                if (x + dx, y + dy) in occupied:
+                i = (y + dy) * stride + x + dx
+                if occupancy[i] or food_at[i] is not None:
                     all_free = False
                     break
             
+            if not all_free:
+                # Crowded board: rather than retrying at random, list every origin
+                # the shape fits at and pick one of those
+                origins = self._free_food_origins(quadrant, cells, x_min_bound, x_max_bound,
+                                                  y_min_bound, y_max_bound)
+                if len(origins):
+                    row, col = divmod(int(origins[self._np_rng.integers(len(origins))]),
+                                      x_max_bound - x_min_bound + 1)
+                    x, y = x_min_bound + col, y_min_bound + row
+                    all_free = True
+            
             if all_free:
                 food = Food(
-                    position=Position(x, y),
+                    position=P(x, y),
                     value=food_data["value"],
                     health=food_data["health"],
                     max_health=food_data["max_health"],
@@ -746,110 +975,150 @@ class GameManager:
                 if quadrant not in self.state.foods:
                     self.state.foods[quadrant] = []
                 self.state.foods[quadrant].append(food)
+                self._foods_changed = True
+                self._food_soa.pop(quadrant, None)
+                for c in food.cell_ids:
+                    food_at[c] = food
                 return
             attempts += 1
     
+    def _free_food_origins(self, quadrant: int, cells: List[Tuple[int, int]], x_lo: int, x_hi: int,
+                           y_lo: int, y_hi: int) -> np.ndarray:
+        """Flat indices (row * width + col) into the origin window [x_lo, x_hi] x [y_lo, y_hi]
+        of every origin where all of a food's cells avoid walls, snakes and other food"""
+        max_dx = max(c[0] for c in cells)
+        max_dy = max(c[1] for c in cells)
+        rows, cols = y_hi - y_lo + 1, x_hi - x_lo + 1
+        # Blocked cells over the window plus the shape's reach beyond it
+        blocked = self._occ_np.reshape(-1, self._stride)[y_lo:y_hi + max_dy + 1,
+                                                         x_lo:x_hi + max_dx + 1] != 0
+        for food in self.state.foods.get(quadrant, ()):
+            for c in food.cell_ids:
+                fy, fx = (c >> CELL_SHIFT) - y_lo, (c & CELL_MASK) - x_lo
+                if 0 <= fy < blocked.shape[0] and 0 <= fx < blocked.shape[1]:
+                    blocked[fy, fx] = True
+        fits = np.ones((rows, cols), dtype=np.bool_)
+        for dx, dy in cells:
+            fits &= ~blocked[dy:dy + rows, dx:dx + cols]
+        return np.flatnonzero(fits)
+    
     def handle_input(self, player_id: int, direction: str):
         """Handle player input"""
         player = self.state.players.get(player_id)
         if not player or not player.snake or not player.snake.alive:
             return
         
-        try:
-            new_dir = Direction(direction)
-        except ValueError:
+        new_dir = DIRECTION_FROM_NAME.get(direction)
+        if new_dir is None:
             return
         
-        # Prevent 180-degree turns
-        current = player.snake.direction
-        opposite = {
-            Direction.UP: Direction.DOWN,
-            Direction.DOWN: Direction.UP,
-            Direction.LEFT: Direction.RIGHT,
-            Direction.RIGHT: Direction.LEFT
-        }
-        
-        if new_dir != opposite.get(current):
+        # Prevent 180-degree turns (opposites differ only in the low bit)
+        if new_dir ^ player.snake.direction != 1:
             player.snake.next_direction = new_dir
     
     def update(self, dt: float):
         """Update game state"""
-        if not self.state.running or self.state.paused or self.state.game_over:
+        if not self._begin_tick(dt):
+            return
+        due = self._ai_players_due()
+        self._apply_ai_decisions(self._decide_ai_batch(due, self._ai_batch_inputs(due)))
+        self._end_tick()
+    
+    async def update_async(self, dt: float):
+        """update() for the game loop: AI decisions are made on a worker thread,
+        from the state captured at this point, so they don't stall the event loop."""
+        if not self._begin_tick(dt):
             return
+        due = self._ai_players_due()
+        if due:
+            # Default executor: rooms don't queue behind each other's AI work. A
+            # manager awaits its own batch, so its scratch buffers still see one thread
+            decisions = await asyncio.get_running_loop().run_in_executor(
+                None, self._decide_ai_batch, due, self._ai_batch_inputs(due)
+            )
+            self._apply_ai_decisions(decisions)
+        self._end_tick()
+    
+    def _begin_tick(self, dt: float) -> bool:
+        """Advance timers and mode logic; returns False when the game isn't running"""
+        if not self.state.running or self.state.paused or self.state.game_over:
+            return False
         
+        self._dirty = True
+        self._tick_ns = time.monotonic_ns()
+        dt = min(max(dt, 0.0), _MAX_TICK_DT)
         self.state.elapsed_time += dt
         
-        # Tick down spawn_freeze timers on all snakes
-        for player in self.state.players.values():
-            if player.snake and player.snake.spawn_freeze > 0:
-                player.snake.spawn_freeze = max(0.0, player.snake.spawn_freeze - dt)
+        # One pass for the per-snake timers: spawn freeze on every snake, and
+        # combo expiry in the modes that keep combos alive on a timer
+        tick_combos = self._tick_combos
+        for player in self._players_list:
+            snake = player.snake
+            if not snake:
+                continue
+            if snake.spawn_freeze > 0:
+                snake.spawn_freeze = max(0.0, snake.spawn_freeze - dt)
+            if tick_combos and snake.alive and snake.combo_timer > 0:
+                snake.combo_timer -= dt
+                if snake.combo_timer <= 0:
+                    snake.combo = 0
         
         # Tick down hit-recovery windows on all food (non-consecutive hit enforcement)
         for quadrant_foods in self.state.foods.values():
             for food in quadrant_foods:
                 if food.hit_recovery > 0:
                     food.hit_recovery = max(0.0, food.hit_recovery - dt)
+                    self._foods_changed = True
         
-        # Mode-specific updates
-        if self.state.mode == GameMode.SURVIVAL:
-            self._update_survival(dt)
-        elif self.state.mode == GameMode.HIGH_SCORE:
-            self._update_high_score(dt)
-        elif self.state.mode == GameMode.BATTLE_ROYALE:
-            self._update_battle_royale(dt)
-        elif self.state.mode == GameMode.DUEL:
-            self._update_duel(dt)
-        elif self.state.mode == GameMode.SINGLE_PLAYER:
-            self._update_single_player(dt)
-        
-        # Build shared base blocked set once per tick for all AI players
-        self._shared_blocked_cache = {}  # quadrant -> set of (x, y)
-        
-        current_time = time.time()
-        for player in self.state.players.values():
-            if player.is_ai and player.snake and player.snake.alive:
-                if player.snake.spawn_freeze <= 0:
-                    self._update_ai_snake(player, current_time)
-        
-        self._shared_blocked_cache = {}
-        
-        # Move snakes (skip if in spawn freeze)
-        for player in self.state.players.values():
-            if player.snake and player.snake.alive and player.snake.spawn_freeze <= 0:
+        # Mode-specific updates (handler resolved once in setup_game)
+        if self._update_mode:
+            self._update_mode(dt)
+        return True
+    
+    def _end_tick(self):
+        """Move snakes and resolve collisions and win conditions once AI directions are in"""
+        # Move snakes (skip if in spawn freeze); a move can kill, so walk a snapshot
+        for player in tuple(self._alive_players.values()):
+            if player.snake.spawn_freeze <= 0:
                 self._move_snake(player)
         
         # Battle Royale: check snake-to-snake collisions after all moves
-        if self.state.mode == GameMode.BATTLE_ROYALE:
+        if self._is_battle_royale:
             self._check_snake_collisions()
         
         # Check win conditions
         self._check_win_conditions()
     
-    def _update_single_player(self, dt: float):
-        """Update single player mode specifics"""
-        # Update combo timers
-        for player in self.state.players.values():
-            if player.snake and player.snake.alive:
-                if player.snake.combo_timer > 0:
-                    player.snake.combo_timer -= dt
-                    if player.snake.combo_timer <= 0:
-                        player.snake.combo = 0
-        
-        # Gradually increase speed based on score
-        for player in self.state.players.values():
-            if player.snake:
-                # Increase speed every 500 points
-                speed_increases = player.snake.score // 500
-                new_speed = self.state.base_speed * (0.95 ** speed_increases)
-                self.state.current_speed = max(50, new_speed)
+    def _apply_speed_ramp(self):
+        """Timed speed increase for high score / battle royale. The expected speed only
+        changes when another interval has passed, so it is recomputed only then."""
+        intervals_passed = int(self.state.elapsed_time / self.state.speed_increase_interval)
+        if intervals_passed == self._speed_intervals:
+            return
+        self._speed_intervals = intervals_passed
+        expected_speed = self.state.base_speed * (self.state.speed_increase_factor ** intervals_passed)
+        if self.state.current_speed > expected_speed:
+            self.state.current_speed = max(50, expected_speed)  # Min 50ms
     
-    def _get_survival_decay_interval(self) -> float:
-        """Decay interval shrinks over time — more pressure as the game progresses."""
+    def _update_single_player_speed(self, score: int):
+        """Single player gets faster every 500 points; called whenever the score changes"""
+        speed_increases = score // 500
+        if speed_increases != self._speed_intervals:
+            self._speed_intervals = speed_increases
+            new_speed = self.state.base_speed * (0.95 ** speed_increases)
+            self.state.current_speed = max(50, new_speed)
+    
+    # (elapsed time the interval lasts until, decay interval in seconds)
+    _SURVIVAL_DECAY_STEPS = ((30.0, 6.0), (60.0, 5.0), (120.0, 4.0), (math.inf, 3.0))
+
+    def _get_survival_decay_interval(self) -> Tuple[float, float]:
+        """Decay interval shrinks over time — more pressure as the game progresses.
+        Returns (interval, elapsed time at which the interval next changes)."""
         t = self.state.elapsed_time
-        if t < 30:   return 6.0
-        elif t < 60: return 5.0
-        elif t < 120: return 4.0
-        else:        return 3.0
+        for change_at, interval in self._SURVIVAL_DECAY_STEPS:
+            if t < change_at:
+                return interval, change_at
+        return self._SURVIVAL_DECAY_STEPS[-1][1], math.inf
 
     def _apply_tail_decay(self, player: Player):
         """Remove last tail segment; kill snake if body drops below minimum length."""
@@ -857,7 +1126,7 @@ class GameManager:
         if not snake or not snake.alive:
             return
         if len(snake.body) > self.state.survival_decay_min_length:
-            snake.body.pop()
+            self._pop_tail(snake)
         else:
             # Too short — starved to death
             self._kill_snake(player)
@@ -877,33 +1146,23 @@ class GameManager:
             self.state.survival_speed_next_increase += self.state.survival_speed_increase_interval
 
         # --- Tail decay: each living snake loses a segment periodically ---
-        decay_interval = self._get_survival_decay_interval()
+        # The interval only steps down at fixed times, so recompute it only then
+        if self.state.elapsed_time >= self._next_decay_change_at:
+            self._current_decay_interval, self._next_decay_change_at = self._get_survival_decay_interval()
+        decay_interval = self._current_decay_interval
         self.state.survival_decay_current_interval = decay_interval
 
-        for player in self.state.players.values():
-            if player.snake and player.snake.alive:
-                player.snake.decay_timer -= dt
-                if player.snake.decay_timer <= 0:
-                    self._apply_tail_decay(player)
-                    # Reset timer only if still alive after decay
-                    if player.snake and player.snake.alive:
-                        player.snake.decay_timer = decay_interval
+        for player in tuple(self._alive_players.values()):
+            player.snake.decay_timer -= dt
+            if player.snake.decay_timer <= 0:
+                self._apply_tail_decay(player)
+                # Reset timer only if still alive after decay
+                if player.snake and player.snake.alive:
+                    player.snake.decay_timer = decay_interval
     
     def _update_high_score(self, dt: float):
         """Update high score mode specifics"""
-        # Speed increase
-        intervals_passed = int(self.state.elapsed_time / self.state.speed_increase_interval)
-        expected_speed = self.state.base_speed * (self.state.speed_increase_factor ** intervals_passed)
-        if self.state.current_speed > expected_speed:
-            self.state.current_speed = max(50, expected_speed)  # Min 50ms
-        
-        # Update combo timers
-        for player in self.state.players.values():
-            if player.snake and player.snake.alive:
-                if player.snake.combo_timer > 0:
-                    player.snake.combo_timer -= dt
-                    if player.snake.combo_timer <= 0:
-                        player.snake.combo = 0
+        self._apply_speed_ramp()
         
         # Check time limit
         if self.state.elapsed_time >= self.state.time_limit:
@@ -911,19 +1170,7 @@ class GameManager:
     
     def _update_battle_royale(self, dt: float):
         """Update Battle Royale mode: shared map, timed, combo scoring."""
-        # Speed increase (same as high score)
-        intervals_passed = int(self.state.elapsed_time / self.state.speed_increase_interval)
-        expected_speed = self.state.base_speed * (self.state.speed_increase_factor ** intervals_passed)
-        if self.state.current_speed > expected_speed:
-            self.state.current_speed = max(50, expected_speed)
-        
-        # Update combo timers
-        for player in self.state.players.values():
-            if player.snake and player.snake.alive:
-                if player.snake.combo_timer > 0:
-                    player.snake.combo_timer -= dt
-                    if player.snake.combo_timer <= 0:
-                        player.snake.combo = 0
+        self._apply_speed_ramp()  # Same ramp as high score
         
         # Check time limit
         if self.state.elapsed_time >= self.state.time_limit:
@@ -953,13 +1200,12 @@ class GameManager:
         else:
             decay_interval = 2.5
         self.state.survival_decay_current_interval = decay_interval
-        for player in self.state.players.values():
-            if player.snake and player.snake.alive:
-                player.snake.decay_timer -= dt
-                if player.snake.decay_timer <= 0:
-                    self._apply_tail_decay(player)
-                    if player.snake and player.snake.alive:
-                        player.snake.decay_timer = decay_interval
+        for player in tuple(self._alive_players.values()):
+            player.snake.decay_timer -= dt
+            if player.snake.decay_timer <= 0:
+                self._apply_tail_decay(player)
+                if player.snake and player.snake.alive:
+                    player.snake.decay_timer = decay_interval
 
         # Time limit: if reached, higher score wins
         if self.state.elapsed_time >= self.state.time_limit:
@@ -968,7 +1214,7 @@ class GameManager:
     def _end_duel_round(self):
         """End the current duel round and determine the round winner."""
         players_sorted = sorted(
-            self.state.players.values(),
+            self._players_list,
             key=lambda p: (p.snake.alive if p.snake else False, p.snake.score if p.snake else 0),
             reverse=True
         )
@@ -993,29 +1239,22 @@ class GameManager:
         Snake B survives and continues.
         """
         deaths = []
-        for player in self.state.players.values():
-            if not player.snake or not player.snake.alive:
-                continue
+        alive = self._alive_players.values()
+        for player in alive:
             if player.snake.spawn_freeze > 0:
                 continue  # Invulnerable during spawn freeze
             
             head = player.snake.body[0]
             
             # Check collision with other snakes' bodies
-            for other in self.state.players.values():
+            for other in alive:
                 if other.id == player.id:
                     continue
-                if not other.snake or not other.snake.alive:
-                    continue
                 
                 # Check if our head hit their body (excluding their head for head-on collisions)
-                for body_pos in other.snake.body[1:]:
-                    if head.x == body_pos.x and head.y == body_pos.y:
-                        deaths.append(player)
-                        break
-                else:
-                    continue
-                break
+                if head in islice(other.snake.body, 1, None):
+                    deaths.append(player)
+                    break
         
         # Apply deaths
         for player in deaths:
@@ -1023,6 +1262,8 @@ class GameManager:
 
     def _shrink_arena(self):
         """Shrink all quadrant boundaries"""
+        # Cached wall grids are shaped to the old bounds
+        self._invalidate_wall_cache()
         for q, bounds in self.state.quadrant_bounds.items():
             bounds.x_min += self.state.shrink_amount
             bounds.x_max -= self.state.shrink_amount
@@ -1030,10 +1271,11 @@ class GameManager:
             bounds.y_max -= self.state.shrink_amount
             
             # Check if any snakes are now outside bounds
-            for player in self.state.players.values():
-                if player.quadrant == q and player.snake and player.snake.alive:
+            for player in tuple(self._alive_players.values()):
+                if player.quadrant == q:
                     head = player.snake.body[0]
-                    if not bounds.contains(head):
+                    if not (bounds.x_min <= head & CELL_MASK < bounds.x_max
+                            and bounds.y_min <= head >> CELL_SHIFT < bounds.y_max):
                         self._kill_snake(player)
     
     def _move_snake(self, player: Player):
@@ -1041,113 +1283,105 @@ class GameManager:
         snake = player.snake
         if not snake:
             return
+        state = self.state
+        quadrant = player.quadrant
+        body = snake.body
         
         # Apply next direction
-        snake.direction = snake.next_direction
+        direction = snake.direction = snake.next_direction
         
         # Calculate new head position
-        head = snake.body[0]
-        new_head = Position(head.x, head.y)
-        
-        if snake.direction == Direction.UP:
-            new_head.y -= 1
-        elif snake.direction == Direction.DOWN:
-            new_head.y += 1
-        elif snake.direction == Direction.LEFT:
-            new_head.x -= 1
-        elif snake.direction == Direction.RIGHT:
-            new_head.x += 1
+        head = body[0]
+        dx, dy = _DIR_DXY[direction]
+        nx, ny = (head & CELL_MASK) + dx, (head >> CELL_SHIFT) + dy
         
         # Check collisions
-        bounds = self.state.quadrant_bounds.get(player.quadrant)
+        bounds = state.quadrant_bounds.get(quadrant)
         if bounds:
             # Boundary collision
-            if not bounds.contains(new_head):
+            if not (bounds.x_min <= nx < bounds.x_max and bounds.y_min <= ny < bounds.y_max):
                 self._kill_snake(player)
                 return
+        new_head = (ny << CELL_SHIFT) | nx
         
         # Wall collision
-        wall_positions = self._get_wall_positions(player.quadrant)
-        if (new_head.x, new_head.y) in wall_positions:
+        if self._wall_mask[new_head]:
             self._kill_snake(player)
             return
         
-        # Self collision
-        if new_head in snake.body[:-1]:
+        # Self collision (the tail cell is excluded — it moves out of the way)
+        if new_head in snake.body_cells and new_head != body[-1]:
             self._kill_snake(player)
             return
         
         # Add new head
-        snake.body.insert(0, new_head)
-        
-        # Check food collision (check all cells of multi-cell food)
-        ate_food = False
-        foods = self.state.foods.get(player.quadrant, [])
-        barrier_config = BARRIER_CONFIGS.get(self.state.barrier_density, BARRIER_CONFIGS["none"])
+        self._push_head(snake, new_head)
+        
+        # Food cells are indexed on the board, so the hit test is one lookup.
+        # Animals in their hit-recovery window can't be hit (non-consecutive rule)
+        food = self._food_at[new_head]
+        if food is None or food.hit_recovery > 0:
+            # Remove tail if no food eaten
+            self._pop_tail(snake)
+            return
         
-        for food in foods[:]:  # Copy list to allow removal
-            # Skip animals that are in their hit-recovery window (non-consecutive rule)
-            if food.hit_recovery > 0:
-                continue
+        mode = state.mode
+        multiplier = BARRIER_CONFIGS.get(state.barrier_density, BARRIER_CONFIGS["none"])["multiplier"]
+        food.health -= 1
+        self._foods_changed = True
+        
+        if food.health <= 0:
+            # Final hit — food is consumed
+            if mode == GameMode.BATTLE_ROYALE:
+                # Battle Royale: only the killing hit scores (full value + combo)
+                score = int(food.value * multiplier)
+                snake.combo += 1
+                snake.combo_timer = 2.0
+                score = int(score * (1 + snake.combo * 0.1))
+            else:
+                # Other modes: per-hit scoring
+                base_pts_per_hit = food.value // food.max_health
+                score = int(base_pts_per_hit * multiplier)
+                
+                # Combo bonus applies on the kill hit
+                if mode in (GameMode.HIGH_SCORE, GameMode.SINGLE_PLAYER, GameMode.SURVIVAL):
+                    snake.combo += 1
+                    snake.combo_timer = 2.0
+                    score = int(score * (1 + snake.combo * 0.1))
             
-            # Check if head hit any cell of this food
-            food_positions = food.get_all_positions()
-            hit = any(new_head.x == fp.x and new_head.y == fp.y for fp in food_positions)
+            # Survival mode: eating resets the decay timer
+            if mode == GameMode.SURVIVAL:
+                snake.decay_timer = self._current_decay_interval
             
-            if hit:
-                food.health -= 1
-                
-                if food.health <= 0:
-                    # Final hit — food is consumed
-                    if self.state.mode == GameMode.BATTLE_ROYALE:
-                        # Battle Royale: only the killing hit scores (full value + combo)
-                        score = int(food.value * barrier_config["multiplier"])
-                        snake.combo += 1
-                        snake.combo_timer = 2.0
-                        score = int(score * (1 + snake.combo * 0.1))
-                    else:
-                        # Other modes: per-hit scoring
-                        base_pts_per_hit = food.value // food.max_health
-                        score = int(base_pts_per_hit * barrier_config["multiplier"])
-                        
-                        # Combo bonus applies on the kill hit
-                        if self.state.mode in [GameMode.HIGH_SCORE, GameMode.SINGLE_PLAYER, GameMode.SURVIVAL]:
-                            snake.combo += 1
-                            snake.combo_timer = 2.0
-                            score = int(score * (1 + snake.combo * 0.1))
-                    
-                    # Survival mode: eating resets the decay timer
-                    if self.state.mode == GameMode.SURVIVAL:
-                        snake.decay_timer = self._get_survival_decay_interval()
-                    
-                    snake.score += score
-                    foods.remove(food)
-                    self._spawn_food(player.quadrant)
-                    
-                    if self.state.mode == GameMode.SINGLE_PLAYER:
-                        if snake.score > self.state.single_player_high_score:
-                            self.state.single_player_high_score = snake.score
-                else:
-                    # Partial hit — only award score in non-Battle Royale modes
-                    if self.state.mode != GameMode.BATTLE_ROYALE:
-                        base_pts_per_hit = food.value // food.max_health
-                        score = int(base_pts_per_hit * barrier_config["multiplier"])
-                        snake.score += score
-                        
-                        if self.state.mode == GameMode.SINGLE_PLAYER:
-                            if snake.score > self.state.single_player_high_score:
-                                self.state.single_player_high_score = snake.score
-                    
-                    # Begin recovery: snake must leave and re-approach for next hit
-                    recovery_duration = FOOD_HIT_RECOVERY.get(food.category, 0.0)
-                    food.hit_recovery = recovery_duration
+            snake.score += score
+            # Food order doesn't matter — swap with the last entry and pop in O(1)
+            foods = state.foods[quadrant]
+            idx = next(j for j, f in enumerate(foods) if f is food)
+            foods[idx] = foods[-1]
+            foods.pop()
+            self._food_soa.pop(quadrant, None)
+            food_at = self._food_at
+            for c in food.cell_ids:
+                food_at[c] = None
+            self._spawn_food(quadrant)
+            
+            if mode == GameMode.SINGLE_PLAYER:
+                if snake.score > state.single_player_high_score:
+                    state.single_player_high_score = snake.score
+                self._update_single_player_speed(snake.score)
+        else:
+            # Partial hit — only award score in non-Battle Royale modes
+            if mode != GameMode.BATTLE_ROYALE:
+                base_pts_per_hit = food.value // food.max_health
+                snake.score += int(base_pts_per_hit * multiplier)
                 
-                ate_food = True
-                break
-        
-        # Remove tail if no food eaten
-        if not ate_food:
-            snake.body.pop()
+                if mode == GameMode.SINGLE_PLAYER:
+                    if snake.score > state.single_player_high_score:
+                        state.single_player_high_score = snake.score
+                    self._update_single_player_speed(snake.score)
+            
+            # Begin recovery: snake must leave and re-approach for next hit
+            food.hit_recovery = FOOD_HIT_RECOVERY.get(food.category, 0.0)
     
     # Fibonacci respawn delays (seconds): 2, 3, 5, 8, 13, 21 then capped
     _RESPAWN_FIBONACCI = [2, 3, 5, 8, 13, 21]
@@ -1162,9 +1396,14 @@ class GameManager:
         if not player.snake:
             return
         
+        # A dead snake no longer blocks anything
+        if player.snake.alive:
+            for c in player.snake.body:
+                self._unmark(c)
+        
         player.snake.alive = False
         player.state = PlayerState.DEAD
-        player.death_time = time.time()
+        player.death_time = self._tick_ns
         player.death_count += 1
         
         # Progressive respawn penalty in high score and battle royale modes (fibonacci)
@@ -1172,36 +1411,48 @@ class GameManager:
             player.respawn_delay = self._get_respawn_delay(player.death_count)
         
         self.state.alive_count -= 1
+        self._alive_players.pop(player.id, None)
+        self._alive_ai.pop(player.id, None)
         
         # Assign rank (for survival mode)
         if self.state.mode == GameMode.SURVIVAL:
             player.rank = self.state.alive_count + 1
     
+    def _place_snake(self, player: Player, length: int = 3):
+        """Lay a player's snake down at a safe spawn in its quadrant.
+        
+        The body runs back from the head, opposite to the facing direction, and is
+        refilled in place (deque and count map) with every segment marked on the
+        occupancy grid. Battle Royale spawns also keep clear of other snakes.
+        """
+        if self.state.mode == GameMode.BATTLE_ROYALE:
+            start_x, start_y, direction = self._find_safe_spawn_battle_royale(player.quadrant)
+        else:
+            start_x, start_y, direction = self._find_safe_spawn(player.quadrant)
+        
+        vx, vy = _DIR_DXY[direction]
+        step = (vy << CELL_SHIFT) + vx
+        
+        snake = player.snake
+        body = snake.body
+        body_cells = snake.body_cells
+        body.clear()
+        body_cells.clear()
+        c = cell(start_x, start_y)
+        for _ in range(length):
+            body.append(c)
+            body_cells[c] = body_cells.get(c, 0) + 1
+            self._mark(c)
+            c -= step
+        snake.direction = direction
+        snake.next_direction = direction
+    
     def _respawn_snake(self, player: Player):
         """Respawn a snake (for high score / battle royale modes)"""
         bounds = self.state.quadrant_bounds.get(player.quadrant)
         if not bounds:
             return
         
-        wall_positions = self._get_wall_positions(player.quadrant)
-        
-        # Battle Royale: use spawn that avoids other snakes
-        if self.state.mode == GameMode.BATTLE_ROYALE:
-            start_x, start_y, direction = self._find_safe_spawn_battle_royale(
-                player.quadrant, wall_positions, player.id
-            )
-        else:
-            start_x, start_y, direction = self._find_safe_spawn(player.quadrant, wall_positions)
-        
-        # Get direction vector for body placement
-        dir_vectors = {
-            Direction.RIGHT: (1, 0),
-            Direction.LEFT: (-1, 0),
-            Direction.UP: (0, -1),
-            Direction.DOWN: (0, 1)
-        }
-        vx, vy = dir_vectors[direction]
-        
         # Determine respawn length
         if self.state.mode == GameMode.BATTLE_ROYALE:
             # Battle Royale: halve length (round up), minimum 3
@@ -1210,14 +1461,18 @@ class GameManager:
         else:
             new_length = 3
         
-        player.snake.body = [Position(start_x - vx * j, start_y - vy * j) for j in range(new_length)]
-        player.snake.direction = direction
-        player.snake.next_direction = direction
-        player.snake.alive = True
-        player.snake.combo = 0
-        player.snake.spawn_freeze = 1.0  # 1 second invulnerability after respawn
+        self._place_snake(player, new_length)
+        snake = player.snake
+        snake.alive = True
+        snake.combo = 0
+        snake.spawn_freeze = 1.0  # 1 second invulnerability after respawn
         player.state = PlayerState.PLAYING
         self.state.alive_count += 1
+        # Rebuilt rather than appended so the live sets stay in roster order (move order)
+        self._alive_players = {p.id: p for p in self._players_list if p.snake and p.snake.alive}
+        self._alive_ai = {pid: p for pid, p in self._alive_players.items() if p.is_ai}
+        self._body_resets.add(player.id)
+        self._dirty = True
     
     def _check_win_conditions(self):
         """Check if game should end"""
@@ -1226,18 +1481,17 @@ class GameManager:
             normal_end = self.state.alive_count <= 1
 
             # Early end: all humans quit — only AI remain in the game
-            humans_still_in_game = any(
+            # (the roster scan is skipped when the game is already over)
+            all_humans_gone = not normal_end and not any(
                 not p.is_ai and p.id not in self._mid_game_quit
-                for p in self.state.players.values()
+                for p in self._players_list
             )
-            all_humans_gone = not humans_still_in_game
 
             if normal_end or all_humans_gone:
-                for player in self.state.players.values():
-                    if player.snake and player.snake.alive:
-                        player.rank = 1
-                        self.state.winner_id = player.id
-                        break
+                winner = next(iter(self._alive_players.values()), None)
+                if winner is not None:
+                    winner.rank = 1
+                    self.state.winner_id = winner.id
                 self.state.game_over = True
                 self.state.running = False
         
@@ -1248,7 +1502,7 @@ class GameManager:
         
         elif self.state.mode == GameMode.SINGLE_PLAYER:
             if self.state.alive_count <= 0:
-                for player in self.state.players.values():
+                for player in self._players_list:
                     player.rank = 1
                     self.state.winner_id = player.id
                 self.state.game_over = True
@@ -1261,7 +1515,7 @@ class GameManager:
         
         # Sort by score and assign ranks
         players_sorted = sorted(
-            self.state.players.values(),
+            self._players_list,
             key=lambda p: p.snake.score if p.snake else 0,
             reverse=True
         )
@@ -1274,286 +1528,426 @@ class GameManager:
     
     # ==================== AI Snake Logic ====================
 
-    def _update_ai_snake(self, player: Player, current_time: float):
-        """Update AI snake decision making"""
-        if not player.snake or not player.snake.alive:
-            return
-
-        settings = AI_DIFFICULTY_SETTINGS.get(
-            player.ai_difficulty, AI_DIFFICULTY_SETTINGS["amateur"]
-        )
-        reaction_time = settings["reaction_time"] / 1000.0
-
-        if current_time - player.ai_last_decision < reaction_time:
-            return
-
-        player.ai_last_decision = current_time
-        new_direction = self._ai_decide_direction(player, settings)
-
-        if new_direction and new_direction != self._OPPOSITE.get(player.snake.direction):
-            player.snake.next_direction = new_direction
+    def _ai_players_due(self) -> List[Tuple[Player, dict]]:
+        """AI players whose reaction time has elapsed, with their difficulty settings.
+        Marks them as having decided now."""
+        current_time = self._tick_ns
+        due = []
+        for player in self._alive_ai.values():
+            snake = player.snake
+            if snake.spawn_freeze <= 0:
+                settings = AI_DIFFICULTY_SETTINGS.get(
+                    player.ai_difficulty, AI_DIFFICULTY_SETTINGS["amateur"]
+                )
+                if current_time - player.ai_last_decision >= settings["reaction_time"] * 1_000_000:
+                    player.ai_last_decision = current_time
+                    due.append((player, settings))
+        return due
+
+    def _ai_batch_inputs(self, due: List[Tuple[Player, dict]]) -> _AIBatch:
+        """Capture what the due AI players decide from (call on the event loop). Each
+        quadrant's walkable mask is built once and shared by every AI deciding in it."""
+        walks = {}
+        foods = {}
+        for player, _ in due:
+            q = player.quadrant
+            bounds = self.state.quadrant_bounds.get(q)
+            if q in walks or not bounds:
+                continue
+            walks[q] = self._ai_walkable(bounds)
+            quadrant_foods = list(self.state.foods.get(q, []))
+            if quadrant_foods:
+                foods[q] = (quadrant_foods, self._food_soa_for(q, quadrant_foods))
+        draws = self._np_rng.random((len(due), 1 + len(_DIR_DXY))).tolist()
+        return _AIBatch(walks, self._occ_np.copy(), foods, draws, {})
+
+    def _decide_ai_batch(self, due: List[Tuple[Player, dict]],
+                         batch: _AIBatch) -> List[Tuple[Player, Optional[Direction]]]:
+        """Pick a direction for each due AI player from the inputs captured in batch.
+        Touches nothing the game loop writes, so it can run on a worker thread while
+        the loop waits for it."""
+        return [(player, self._ai_decide_direction(player, settings, batch, draws))
+                for (player, settings), draws in zip(due, batch.draws)]
+
+    def _apply_ai_decisions(self, decisions: List[Tuple[Player, Optional[Direction]]]):
+        """Queue each AI's chosen direction (never a reversal)"""
+        for player, new_direction in decisions:
+            if new_direction is not None and new_direction != _OPPOSITE_IDX[player.snake.direction]:
+                player.snake.next_direction = new_direction
 
     # ---- helpers ----
 
-    def _ai_build_blocked(self, player: Player) -> Set[Tuple[int, int]]:
-        """All cells that would kill the snake on the next step.
-        Uses a shared per-quadrant cache for walls + all snake bodies to avoid
-        rebuilding the same set for every AI player on the same quadrant.
-        """
-        quadrant = player.quadrant
-        if quadrant not in self._shared_blocked_cache:
-            base = set(self._get_wall_positions(quadrant))
-            for p in self.state.players.values():
-                if p.quadrant == quadrant and p.snake and p.snake.alive:
-                    for pos in p.snake.body:
-                        base.add((pos.x, pos.y))
-            self._shared_blocked_cache[quadrant] = base
-        # Clone the shared set and remove this snake's own tail tip (it will move)
-        blocked = set(self._shared_blocked_cache[quadrant])
-        # The tail tip of our own snake will move away, so it's not actually blocked
-        if player.snake.body:
-            tail = player.snake.body[-1]
-            blocked.discard((tail.x, tail.y))
-        return blocked
-
-    def _ai_safe_dirs(self, player: Player, bounds: QuadrantBounds,
-                      blocked: Set[Tuple[int, int]]) -> List[Direction]:
+    def _ai_walkable(self, bounds: QuadrantBounds) -> Tuple[np.ndarray, bytearray]:
+        """Walkable mask (1 = free) of a quadrant, padded with a blocked 1-cell border so
+        neighbour tests need no bounds checks. Returned as a uint8 array and as the
+        bytearray it views; (x, y) sits at (y - y_min + 1) * (width + 2) + (x - x_min + 1)."""
+        shape = (bounds.y_max - bounds.y_min + 2, bounds.x_max - bounds.x_min + 2)
+        buf = bytearray(shape[0] * shape[1])
+        walk = np.frombuffer(buf, dtype=np.uint8).reshape(shape)
+        walk[1:-1, 1:-1] = self._occ_np.reshape(-1, self._stride)[
+            bounds.y_min:bounds.y_max, bounds.x_min:bounds.x_max] == 0
+        return walk, buf
+
+    def _ai_safe_dirs(self, player: Player, walk: bytearray, hi: int, steps: Tuple[int, ...]) -> List[Direction]:
         """Directions where the immediate next cell is in-bounds and unblocked."""
-        head = player.snake.body[0]
-        current = player.snake.direction
-        safe = []
-        for d, (dx, dy) in self._DIR_VECTORS.items():
-            if d == self._OPPOSITE.get(current):
-                continue
-            nx, ny = head.x + dx, head.y + dy
-            if (bounds.x_min <= nx < bounds.x_max
-                    and bounds.y_min <= ny < bounds.y_max
-                    and (nx, ny) not in blocked):
-                safe.append(d)
-        return safe
+        opposite = _OPPOSITE_IDX[player.snake.direction]
+        return [d for d in Direction if d != opposite and walk[hi + steps[d]]]
 
     def _flood_fill_count(self, sx: int, sy: int, bounds: QuadrantBounds,
-                          blocked: Set[Tuple[int, int]], max_depth: int) -> int:
-        """BFS flood-fill counting reachable cells (uses deque for O(n) performance)."""
-        visited = {(sx, sy)}
-        q = deque()
-        q.append((sx, sy, 0))
+                          free: np.ndarray, max_depth: int) -> int:
+        """Count cells reachable within max_depth steps by repeated 4-neighbour dilation.
+        `free` is the quadrant's walkable mask (origin at bounds.x_min, bounds.y_min)."""
         if (not (bounds.x_min <= sx < bounds.x_max and bounds.y_min <= sy < bounds.y_max)
-                or (sx, sy) in blocked):
+                or not free[sy - bounds.y_min, sx - bounds.x_min]):
             return 0
+        # Only the diamond of radius max_depth around the start can be reached
+        lx, ly = sx - bounds.x_min, sy - bounds.y_min
+        x0, y0 = max(lx - max_depth, 0), max(ly - max_depth, 0)
+        window = free[y0:ly + max_depth + 1, x0:lx + max_depth + 1]
+        reach = np.zeros_like(window)
+        reach[ly - y0, lx - x0] = True
         count = 1
-        while q:
-            x, y, depth = q.popleft()
-            if depth >= max_depth:
-                continue
-            for dx, dy in ((0, -1), (0, 1), (-1, 0), (1, 0)):
-                nx, ny = x + dx, y + dy
-                if (nx, ny) not in visited:
-                    visited.add((nx, ny))
-                    if (bounds.x_min <= nx < bounds.x_max
-                            and bounds.y_min <= ny < bounds.y_max
-                            and (nx, ny) not in blocked):
-                        count += 1
-                        q.append((nx, ny, depth + 1))
+        for _ in range(max_depth):
+            grown = reach.copy()
+            grown[1:] |= reach[:-1]
+            grown[:-1] |= reach[1:]
+            grown[:, 1:] |= reach[:, :-1]
+            grown[:, :-1] |= reach[:, 1:]
+            grown &= window
+            new_count = int(np.count_nonzero(grown))
+            if new_count == count:
+                break
+            reach, count = grown, new_count
         return count
 
     def _ai_bfs_to_food(self, hx: int, hy: int,
                          target_cells: Set[Tuple[int, int]],
-                         bounds: QuadrantBounds,
-                         blocked: Set[Tuple[int, int]],
+                         bounds: QuadrantBounds, walk: bytearray, occ: np.ndarray,
                          max_depth: int) -> Optional[Direction]:
-        """BFS shortest path from head to any target cell; returns the first-step direction."""
-        visited = {(hx, hy)}
-        q = deque()
-        for d, (dx, dy) in self._DIR_VECTORS.items():
-            nx, ny = hx + dx, hy + dy
-            if (nx, ny) in target_cells:
+        """BFS shortest path from head to any target cell; returns the first-step direction.
+        `walk` is the padded quadrant mask from _ai_walkable, `occ` the occupancy grid
+        the Numba kernel searches instead."""
+        if HAVE_NUMBA:
+            tx = np.fromiter((c[0] for c in target_cells), dtype=np.int32, count=len(target_cells))
+            ty = np.fromiter((c[1] for c in target_cells), dtype=np.int32, count=len(target_cells))
+            step = bfs_first_step(occ, self._stride, bounds.x_min, bounds.x_max,
+                                  bounds.y_min, bounds.y_max, hx, hy, tx, ty, max_depth)
+            return Direction(step) if step >= 0 else None
+        x0, y0 = bounds.x_min - 1, bounds.y_min - 1
+        row = bounds.x_max - x0 + 1
+        height = len(walk) // row
+        steps = (-row, row, -1, 1)
+        # Targets off the padded mask can never be a neighbour of a reachable cell
+        targets = {(y - y0) * row + (x - x0) for x, y in target_cells
+                   if 0 <= x - x0 < row and 0 <= y - y0 < height}
+        n = len(walk)
+        visited = self._bfs_visited
+        visited[:n] = memoryview(self._bfs_clear)[:n]
+        q_cell, q_first, q_depth = self._bfs_queue
+        hi = (hy - y0) * row + (hx - x0)
+        visited[hi] = 1
+        tail = 0
+        for d in Direction:
+            c = hi + steps[d]
+            if c in targets:
                 return d
-            if ((nx, ny) not in visited
-                    and bounds.x_min <= nx < bounds.x_max
-                    and bounds.y_min <= ny < bounds.y_max
-                    and (nx, ny) not in blocked):
-                visited.add((nx, ny))
-                q.append((nx, ny, d, 1))
-        while q:
-            x, y, first_dir, depth = q.popleft()
+            if walk[c] and not visited[c]:
+                visited[c] = 1
+                q_cell[tail], q_first[tail], q_depth[tail] = c, d, 1
+                tail += 1
+        head = 0
+        while head < tail:
+            c0, first_dir, depth = q_cell[head], q_first[head], q_depth[head]
+            head += 1
             if depth >= max_depth:
                 continue
-            for dx, dy in ((0, -1), (0, 1), (-1, 0), (1, 0)):
-                nx, ny = x + dx, y + dy
-                if (nx, ny) in target_cells:
-                    return first_dir
-                if ((nx, ny) not in visited
-                        and bounds.x_min <= nx < bounds.x_max
-                        and bounds.y_min <= ny < bounds.y_max
-                        and (nx, ny) not in blocked):
-                    visited.add((nx, ny))
-                    q.append((nx, ny, first_dir, depth + 1))
+            for step in steps:
+                c = c0 + step
+                if c in targets:
+                    return Direction(first_dir)
+                if walk[c] and not visited[c]:
+                    visited[c] = 1
+                    q_cell[tail], q_first[tail], q_depth[tail] = c, first_dir, depth + 1
+                    tail += 1
         return None
 
     # ---- food selection (mode-aware) ----
 
+    def _food_soa_for(self, quadrant: int, foods: List[Food]) -> Tuple[np.ndarray, ...]:
+        """Cell coords, per-food start offsets, points per hit and one-shot flags for a quadrant's foods"""
+        soa = self._food_soa.get(quadrant)
+        if soa is None:
+            xs = np.fromiter((f.position.x + dx for f in foods for dx, _ in f.cells), dtype=np.int32)
+            ys = np.fromiter((f.position.y + dy for f in foods for _, dy in f.cells), dtype=np.int32)
+            counts = np.fromiter((len(f.cells) for f in foods), dtype=np.intp, count=len(foods))
+            starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+            pts_per_hit = np.fromiter((f.value / max(f.max_health, 1) for f in foods),
+                                      dtype=np.float64, count=len(foods))
+            one_shot = np.fromiter((f.max_health == 1 for f in foods), dtype=bool, count=len(foods))
+            soa = self._food_soa[quadrant] = (xs, ys, starts, pts_per_hit, one_shot)
+        return soa
+
     def _ai_pick_food(self, player: Player, settings: dict,
-                      bounds: QuadrantBounds) -> Optional[Food]:
-        """Choose the best food target considering game mode, difficulty, and food state."""
-        foods = self.state.foods.get(player.quadrant, [])
-        if not foods:
+                      batch: _AIBatch) -> Optional[Tuple[Food, int, int]]:
+        """Choose the best food target considering game mode, difficulty, and food state.
+        Returns the food together with its cell nearest to the head."""
+        if player.quadrant not in batch.foods:
             return None
+        foods, soa = batch.foods[player.quadrant]
 
-        edible = [f for f in foods if f.hit_recovery <= 0]
-        if not edible:
-            edible = sorted(foods, key=lambda f: f.hit_recovery)[:1]
-        if not edible:
-            return None
+        edible = np.fromiter((f.hit_recovery <= 0 for f in foods), dtype=bool, count=len(foods))
+        if not edible.any():
+            edible[int(np.argmin([f.hit_recovery for f in foods]))] = True
 
         head = player.snake.body[0]
+        hx, hy = head & CELL_MASK, head >> CELL_SHIFT
         mode = self.state.mode
         value_power = settings.get("value_power", 1.0)
-        combo_aware = settings.get("combo_aware", False)
-        survival_aware = settings.get("survival_awareness", False)
-        body_len = len(player.snake.body)
-
-        best = None
-        best_score = -1e9
-
-        for food in edible:
-            food_cells = food.get_all_positions()
-            dist = min(abs(head.x - p.x) + abs(head.y - p.y) for p in food_cells)
-            if dist == 0:
-                dist = 0.5
-
-            pts_per_hit = food.value / max(food.max_health, 1)
-
-            if mode == GameMode.SURVIVAL and survival_aware:
-                # Survival: eating resets decay timer -- prefer quick one-shot food.
-                # When body is short, urgency skyrockets.
-                urgency = 3.0 if body_len <= 5 else (1.5 if body_len <= 8 else 1.0)
-                if food.max_health == 1:
-                    score = (pts_per_hit ** value_power) / dist * 2.0 * urgency
-                else:
-                    score = (pts_per_hit ** value_power) / dist * 0.4 * urgency
-
-            elif mode == GameMode.HIGH_SCORE and combo_aware:
-                # High-score: maximise score-per-second. One-shot food = quick combo building.
-                combo_mult = 1.0 + player.snake.combo * 0.12
-                if food.max_health == 1:
-                    score = (pts_per_hit ** value_power) * combo_mult / dist * 1.8
-                else:
-                    score = (pts_per_hit ** value_power) / dist
-            else:
-                score = (pts_per_hit ** value_power) / dist
-
-            if score > best_score:
-                best_score = score
-                best = food
+        xs, ys, starts, pts_per_hit, one_shot = soa
+
+        # Manhattan distance from the head to the nearest cell of every food at once
+        cell_dist = np.abs(xs - hx) + np.abs(ys - hy)
+        dist = np.minimum.reduceat(cell_dist, starts).astype(np.float64)
+        dist[dist == 0] = 0.5
+        value = pts_per_hit ** value_power
+
+        if mode == GameMode.SURVIVAL and settings.get("survival_awareness", False):
+            # Survival: eating resets decay timer -- prefer quick one-shot food.
+            # When body is short, urgency skyrockets.
+            body_len = len(player.snake.body)
+            urgency = 3.0 if body_len <= 5 else (1.5 if body_len <= 8 else 1.0)
+            scores = value / dist * np.where(one_shot, 2.0, 0.4) * urgency
+        elif mode == GameMode.HIGH_SCORE and settings.get("combo_aware", False):
+            # High-score: maximise score-per-second. One-shot food = quick combo building.
+            combo_mult = 1.0 + player.snake.combo * 0.12
+            scores = np.where(one_shot, value * combo_mult / dist * 1.8, value / dist)
+        else:
+            scores = value / dist
 
-        return best
+        scores[~edible] = -np.inf
+        i = int(np.argmax(scores))
+        # The per-cell distances above also give the winner's nearest cell
+        lo = starts[i]
+        hi = starts[i + 1] if i + 1 < len(starts) else len(xs)
+        j = lo + int(np.argmin(cell_dist[lo:hi]))
+        return foods[i], int(xs[j]), int(ys[j])
 
     # ---- core decision ----
 
-    def _ai_decide_direction(self, player: Player, settings: dict) -> Optional[Direction]:
-        """Score every safe direction and pick the best one."""
-        snake = player.snake
-        head = snake.body[0]
+    def _ai_decide_direction(self, player: Player, settings: dict, batch: _AIBatch,
+                             draws: List[float]) -> Optional[Direction]:
+        """Pick the AI's next direction for this tick from the batch's copies of the
+        board, using draws (see _AIBatch) in place of the game RNG."""
         bounds = self.state.quadrant_bounds.get(player.quadrant)
         if not bounds:
             return None
-
-        blocked = self._ai_build_blocked(player)
-        safe_dirs = self._ai_safe_dirs(player, bounds, blocked)
+        walk_np, walk = batch.walks[player.quadrant]
+
+        # The occupancy grid already holds walls and every live body; our own
+        # tail tip moves away this step, so lift it while deciding
+        occ = batch.occ
+        tail_i = player.snake.body[-1]
+        tx, ty = tail_i & CELL_MASK, tail_i >> CELL_SHIFT
+        wi = -1
+        occ[tail_i] -= 1
+        if not occ[tail_i] and bounds.x_min <= tx < bounds.x_max and bounds.y_min <= ty < bounds.y_max:
+            # Same for the quadrant's walkable mask (the array views the bytearray)
+            wi = (ty - bounds.y_min + 1) * walk_np.shape[1] + (tx - bounds.x_min + 1)
+            walk[wi] = 1
+        try:
+            return self._ai_score_directions(player, settings, bounds, batch, draws)
+        finally:
+            occ[tail_i] += 1
+            if wi >= 0:
+                walk[wi] = 0
+
+    def _ai_score_directions(self, player: Player, settings: dict, bounds: QuadrantBounds,
+                             batch: _AIBatch, draws: List[float]) -> Optional[Direction]:
+        """Score every safe direction against the padded walkable mask of the quadrant
+        (see _ai_walkable) and pick the best one."""
+        walk_np, walk = batch.walks[player.quadrant]
+        snake = player.snake
+        head = snake.body[0]
+        hx, hy = head & CELL_MASK, head >> CELL_SHIFT
+        # Bounds and blockers baked into one padded mask; a step is a fixed index offset
+        row = walk_np.shape[1]
+        steps = (-row, row, -1, 1)
+        hi = (hy - bounds.y_min + 1) * row + (hx - bounds.x_min + 1)
+        safe_dirs = self._ai_safe_dirs(player, walk, hi, steps)
 
         if not safe_dirs:
             return snake.direction
         if len(safe_dirs) == 1:
             return safe_dirs[0]
 
-        scores = {d: 0.0 for d in safe_dirs}
+        # Settings and per-decision inputs are resolved once; the per-direction
+        # contributions below are then summed in a single pass
+        x_min, x_max, y_min, y_max = bounds.x_min, bounds.x_max, bounds.y_min, bounds.y_max
+        current = snake.direction
+        urgent = (settings.get("survival_awareness", False)
+                  and self.state.mode == GameMode.SURVIVAL
+                  and len(snake.body) <= 5)
+        randomness = settings.get("randomness", 0)
 
-        # ── 1. Space evaluation (flood fill or straight-line clearance) ──
+        # ── 1. Space evaluation needs every direction's flood count up front ──
+        flood = None
         if settings.get("dead_end_check", False):
             flood_depth = settings.get("flood_fill_depth", 15)
             flood = {}
+            memo = batch.flood_memo
+            tail = snake.body[-1]
+            tx, ty = tail & CELL_MASK, tail >> CELL_SHIFT
+            # Walkable mask of this quadrant, shared by every direction's fill
+            free = walk_np[1:-1, 1:-1].view(bool)
             for d in safe_dirs:
-                dx, dy = self._DIR_VECTORS[d]
-                flood[d] = self._flood_fill_count(
-                    head.x + dx, head.y + dy, bounds, blocked, flood_depth
-                )
-            max_flood = max(flood.values()) if flood else 1
-            if max_flood > 0:
-                threshold = max_flood * settings.get("dead_end_threshold", 0.3)
-                for d in safe_dirs:
-                    if flood[d] < threshold:
-                        scores[d] -= 10000
-                    else:
-                        scores[d] += (flood[d] / max_flood) * 60
-        else:
-            for d in safe_dirs:
-                dx, dy = self._DIR_VECTORS[d]
-                clear = 0
-                for step in range(1, 7):
-                    cx, cy = head.x + dx * step, head.y + dy * step
-                    if (bounds.x_min <= cx < bounds.x_max
-                            and bounds.y_min <= cy < bounds.y_max
-                            and (cx, cy) not in blocked):
-                        clear += 1
+                dx, dy = _DIR_DXY[d]
+                sx, sy = hx + dx, hy + dy
+                # Boards differ between AIs in the batch only by each one's lifted
+                # tail tip, which matters only to a fill that can reach it
+                key = (player.quadrant, sx, sy, flood_depth,
+                       tail if abs(tx - sx) + abs(ty - sy) <= flood_depth else -1)
+                count = memo.get(key)
+                if count is None:
+                    if HAVE_NUMBA:
+                        count = flood_fill_count(
+                            batch.occ, self._stride, x_min, x_max, y_min, y_max,
+                            sx, sy, flood_depth, (x_max - x_min) * (y_max - y_min)
+                        )
                     else:
-                        break
-                scores[d] += clear * 8
+                        count = self._flood_fill_count(sx, sy, bounds, free, flood_depth)
+                    memo[key] = count
+                flood[d] = count
+            max_flood = max(flood.values())
+            threshold = max_flood * settings.get("dead_end_threshold", 0.3)
 
-        # ── 2. Food targeting ──
+        # ── 2. Food targeting (target and path chosen once per decision) ──
         food_seeking_chance = settings.get("food_seeking", 0.7)
-        seek_food = settings.get("deterministic", False) or random.random() < food_seeking_chance
-
-        if seek_food:
-            target = self._ai_pick_food(player, settings, bounds)
-            if target:
+        seek_food = settings.get("deterministic", False) or draws[0] < food_seeking_chance
+        picked = self._ai_pick_food(player, settings, batch) if seek_food else None
+        target = None
+        path_dir = None
+        if picked:
+            target, nearest_x, nearest_y = picked
+            old_dist = abs(hx - nearest_x) + abs(hy - nearest_y)
+            if settings.get("use_pathfinding", False):
                 target_cells = set(
                     (p.x, p.y) for p in target.get_all_positions()
                 )
-                nearest = min(target_cells,
-                              key=lambda c: abs(head.x - c[0]) + abs(head.y - c[1]))
-
-                bfs_dir = None
-                if settings.get("use_pathfinding", False):
-                    bfs_dir = self._ai_bfs_to_food(
-                        head.x, head.y, target_cells, bounds, blocked,
-                        max_depth=settings.get("pathfinding_depth", 40)
-                    )
+                path_dir = self._ai_bfs_to_food(
+                    hx, hy, target_cells, bounds, walk, batch.occ,
+                    max_depth=settings.get("pathfinding_depth", 40)
+                )
+                if path_dir not in safe_dirs:
+                    path_dir = None
+
+        best = None
+        best_score = -math.inf
+        for d in safe_dirs:
+            dx, dy = _DIR_DXY[d]
+            nx, ny = hx + dx, hy + dy
+            score = 0.0
 
-                if bfs_dir and bfs_dir in safe_dirs:
-                    scores[bfs_dir] += 300
+            # 1. Flood fill space, or straight-line clearance
+            if flood is not None:
+                if max_flood > 0:
+                    if flood[d] < threshold:
+                        score -= 10000
+                    else:
+                        score += (flood[d] / max_flood) * 60
+            else:
+                clear = 0
+                step = steps[d]
+                c = hi + step
+                while clear < 6 and walk[c]:
+                    clear += 1
+                    c += step
+                score += clear * 8
+
+            # 2. Follow the path to food, or at least close the distance
+            if target:
+                if path_dir is not None:
+                    if d == path_dir:
+                        score += 300
                 else:
-                    for d in safe_dirs:
-                        dx, dy = self._DIR_VECTORS[d]
-                        nx, ny = head.x + dx, head.y + dy
-                        new_dist = abs(nx - nearest[0]) + abs(ny - nearest[1])
-                        old_dist = abs(head.x - nearest[0]) + abs(head.y - nearest[1])
-                        if new_dist < old_dist:
-                            scores[d] += 120
-                        elif new_dist == old_dist:
-                            scores[d] += 30
-
-        # ── 3. Survival urgency boost ──
-        if (settings.get("survival_awareness", False)
-                and self.state.mode == GameMode.SURVIVAL
-                and len(snake.body) <= 5):
-            for d in safe_dirs:
-                if scores[d] > 0:
-                    scores[d] *= 2.0
+                    new_dist = abs(nx - nearest_x) + abs(ny - nearest_y)
+                    if new_dist < old_dist:
+                        score += 120
+                    elif new_dist == old_dist:
+                        score += 30
 
-        # ── 4. Prefer continuing straight (smooth movement) ──
-        if snake.direction in safe_dirs:
-            scores[snake.direction] += 10
+            # 3. Survival urgency boost
+            if urgent and score > 0:
+                score *= 2.0
 
-        # ── 5. Randomness (lower difficulties) ──
-        randomness = settings.get("randomness", 0)
-        if randomness > 0:
-            for d in safe_dirs:
-                scores[d] += random.uniform(0, randomness)
+            # 4. Prefer continuing straight (smooth movement)
+            if d == current:
+                score += 10
 
-        return max(safe_dirs, key=lambda d: scores[d])
+            # 5. Randomness (lower difficulties)
+            if randomness > 0:
+                score += randomness * draws[1 + d]
+
+            if score > best_score:
+                best, best_score = d, score
+
+        return best
     
-    def _setup_next_duel_round(self):
+    def full_state(self, include_walls: bool = True) -> dict:
+        """Full state for game_start and end-of-round messages, reusing the walls
+        serialised when they were placed. Clients that already hold the walls for
+        the current walls_version can be sent the state without them."""
+        state = self.state.to_dict(include_walls=False)
+        if include_walls:
+            state["walls"] = self._walls_serialized
+        return state
+    
+    def _state_frame(self) -> dict:
+        """State for a game_state message. Every _KEYFRAME_TICKS a keyframe carries full
+        snake bodies; frames in between send each snake's new head cells and its length,
+        which clients apply on top of the frame numbered "base", and omit foods unless
+        they changed."""
+        self._frame_no += 1
+        keyframe = self._tick >= self._next_keyframe
+        state = self.state.to_dict_delta(include_bodies=keyframe,
+                                         include_foods=keyframe or self._foods_changed)
+        self._foods_changed = False
+        state["frame"] = self._frame_no
+        sent_moves = self._sent_moves
+        if keyframe:
+            self._next_keyframe = self._tick + _KEYFRAME_TICKS
+            state["key"] = True
+            for pid, player in self.state.players.items():
+                if player.snake:
+                    sent_moves[pid] = player.snake.moves
+        else:
+            state["base"] = self._frame_no - 1
+            resets = self._body_resets
+            for pid, player in self.state.players.items():
+                snake = player.snake
+                if not snake:
+                    continue
+                d = state["players"][pid]["snake"]
+                body = snake.body
+                if pid in resets:
+                    d["body"] = [cell_dict(c) for c in body]
+                else:
+                    added = min(snake.moves - sent_moves.get(pid, 0), len(body))
+                    d["head"] = [cell_dict(c) for c in islice(body, added)]
+                    d["len"] = len(body)
+                sent_moves[pid] = snake.moves
+        self._body_resets.clear()
+        return state
+
+    def _resync_frame(self) -> dict:
+        """Keyframe of the last game_state frame, for one client whose outbox had to drop
+        deltas. Nothing has moved since that frame was built, so it can stand in for it;
+        the room's next delta builds on it as usual."""
+        state = self.state.to_dict_delta()
+        state["frame"] = self._frame_no
+        state["key"] = True
+        return {"type": "game_state", "state": state}
+
+    async def _setup_next_duel_round(self):
         """Reset game state for the next duel round while preserving series scores."""
         saved_scores = dict(self.state.series_scores)
         saved_round = self.state.current_round + 1
@@ -1566,12 +1960,12 @@ class GameManager:
         self.state = GameState(
             game_type=self.room.game_type,
             mode=GameMode.DUEL,
-            barrier_density=getattr(self.room, 'barrier_density', 'none')
+            barrier_density=self.room.barrier_density
         )
-        self._wall_position_cache = {}
+        self._wall_grid_cache = {}
         self._mid_game_quit = set()
 
-        self.setup_game()
+        await self.setup_game_async()
 
         # Restore series tracking
         self.state.series_scores = saved_scores
@@ -1586,36 +1980,59 @@ class GameManager:
         """Main game loop — setup_game() must be called before this."""
         await self.broadcast({
             "type": "game_start",
-            "state": self.state.to_dict()
+            "state": self.full_state()
         })
         
         tick_rate = 1 / 30
+        loop = asyncio.get_running_loop()
         
         while True:
             move_accumulator = 0
+            # Ticks are scheduled against fixed deadlines on the loop's monotonic
+            # clock, so sleep overshoot doesn't build up into drift
+            next_tick = loop.time()
             
             while self.state.running and not self.state.game_over:
-                loop_start = time.time()
+                delay = next_tick - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                else:
+                    if delay < -5 * tick_rate:
+                        # Fell far behind (e.g. a stalled host): resync rather than
+                        # running a burst of catch-up ticks
+                        next_tick = loop.time()
+                    # Still yield once so socket handlers get a turn while catching up
+                    await asyncio.sleep(0)
+                next_tick += tick_rate
+                loop_start = time.monotonic_ns()
                 
                 move_accumulator += tick_rate * 1000
                 while move_accumulator >= self.state.current_speed:
-                    self.update(self.state.current_speed / 1000)
+                    await self.update_async(self.state.current_speed / 1000)
                     move_accumulator -= self.state.current_speed
                 
-                await self.broadcast({
-                    "type": "game_state",
-                    "state": self.state.to_dict_delta()
-                })
+                self._tick += 1
+                if self._dirty:
+                    self._dirty = False
+                    frame = {
+                        "type": "game_state",
+                        "state": self._state_frame()
+                    }
+                else:
+                    # Nothing moved this tick — skip serialising the state
+                    frame = {"type": "game_tick", "tick": self._tick}
+                # Don't let a slow client's socket hold up the tick. A client that
+                # fell behind and lost queued deltas is sent _resync_frame instead
+                if self.broadcast_nowait is not None:
+                    self.broadcast_nowait(frame, self._resync_frame)
+                else:
+                    await self.broadcast(frame)
                 
                 if self.state.mode in [GameMode.HIGH_SCORE, GameMode.BATTLE_ROYALE]:
-                    for player in self.state.players.values():
+                    for player in self._players_list:
                         if player.state == PlayerState.DEAD and player.death_time:
-                            if time.time() - player.death_time >= player.respawn_delay:
+                            if loop_start - player.death_time >= player.respawn_delay * 1e9:
                                 self._respawn_snake(player)
-                
-                elapsed = time.time() - loop_start
-                if elapsed < tick_rate:
-                    await asyncio.sleep(tick_rate - elapsed)
             
             # ----- Round/game ended -----
             # For DUEL series: if no series winner yet, broadcast round_over and start next round
@@ -1628,15 +2045,15 @@ class GameManager:
                     "winner_id": self.state.winner_id,
                     "series_scores": self.state.series_scores,
                     "series_length": self.state.series_length,
-                    "final_state": self.state.to_dict()
+                    "final_state": self.full_state(include_walls=False)
                 })
                 # 5-second intermission
                 await asyncio.sleep(5)
                 # Setup next round
-                self._setup_next_duel_round()
+                await self._setup_next_duel_round()
                 await self.broadcast({
                     "type": "game_start",
-                    "state": self.state.to_dict()
+                    "state": self.full_state()
                 })
                 # Brief countdown pause so clients see the new map
                 await asyncio.sleep(1)
@@ -1682,7 +2099,7 @@ class GameManager:
             "winner_id": self.state.winner_id,
             "series_scores": self.state.series_scores if self.state.mode == GameMode.DUEL else {},
             "series_length": self.state.series_length,
-            "final_state": self.state.to_dict()
+            "final_state": self.full_state(include_walls=False)
         })
     
     def player_quit_game(self, player_id: int):
@@ -1715,7 +2132,9 @@ class GameManager:
     def pause(self):
         """Pause the game"""
         self.state.paused = True
+        self._dirty = True
     
     def resume(self):
         """Resume the game"""
         self.state.paused = False
+        self._dirty = True
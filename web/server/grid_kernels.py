@@ -0,0 +1,201 @@
+"""
+Grid search kernels for the snake AI, JIT-compiled with Numba when it is installed.
+
+Every kernel works on the flat occupancy grid (index y * width + x, non-zero = blocked)
+and is written in plain loops over preallocated arrays so the same source runs under
+@njit or as ordinary Python. Callers check HAVE_NUMBA and keep their own pure-Python /
+NumPy paths when it is missing.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+HAVE_NUMBA = njit is not None
+
+# Step vectors in Direction order (up, down, left, right)
+_DX = np.array((0, 0, -1, 1), dtype=np.int32)
+_DY = np.array((-1, 1, 0, 0), dtype=np.int32)
+
+
+def _flood_fill_count(occ, w, x_min, x_max, y_min, y_max, sx, sy, max_depth, max_cells):
+    """Count cells reachable from (sx, sy) within max_depth steps, stopping early
+    once max_cells have been reached."""
+    if not (x_min <= sx < x_max and y_min <= sy < y_max) or occ[sy * w + sx]:
+        return 0
+    visited = np.zeros(occ.shape[0], np.uint8)
+    cap = (x_max - x_min) * (y_max - y_min)
+    qx = np.empty(cap, np.int32)
+    qy = np.empty(cap, np.int32)
+    qd = np.empty(cap, np.int32)
+    visited[sy * w + sx] = 1
+    qx[0] = sx
+    qy[0] = sy
+    qd[0] = 0
+    head = 0
+    tail = 1
+    while head < tail:
+        x = qx[head]
+        y = qy[head]
+        depth = qd[head]
+        head += 1
+        if depth >= max_depth:
+            continue
+        for k in range(4):
+            nx = x + _DX[k]
+            ny = y + _DY[k]
+            if x_min <= nx < x_max and y_min <= ny < y_max:
+                i = ny * w + nx
+                if not visited[i] and not occ[i]:
+                    visited[i] = 1
+                    qx[tail] = nx
+                    qy[tail] = ny
+                    qd[tail] = depth + 1
+                    tail += 1
+                    if tail >= max_cells:
+                        return tail
+    return tail
+
+
+def _is_target(tx, ty, x, y):
+    for j in range(tx.shape[0]):
+        if tx[j] == x and ty[j] == y:
+            return True
+    return False
+
+
+def _bfs_first_step(occ, w, x_min, x_max, y_min, y_max, hx, hy, tx, ty, max_depth):
+    """Shortest path from the head to any (tx, ty) cell; returns the first-step
+    direction index, or -1 when no target is reachable within max_depth."""
+    visited = np.zeros(occ.shape[0], np.uint8)
+    cap = (x_max - x_min) * (y_max - y_min) + 1
+    qx = np.empty(cap, np.int32)
+    qy = np.empty(cap, np.int32)
+    qf = np.empty(cap, np.int32)
+    qd = np.empty(cap, np.int32)
+    if x_min <= hx < x_max and y_min <= hy < y_max:
+        visited[hy * w + hx] = 1
+    head = 0
+    tail = 0
+    for k in range(4):
+        nx = hx + _DX[k]
+        ny = hy + _DY[k]
+        if _is_target(tx, ty, nx, ny):
+            return k
+        if x_min <= nx < x_max and y_min <= ny < y_max:
+            i = ny * w + nx
+            if not visited[i] and not occ[i]:
+                visited[i] = 1
+                qx[tail] = nx
+                qy[tail] = ny
+                qf[tail] = k
+                qd[tail] = 1
+                tail += 1
+    while head < tail:
+        x = qx[head]
+        y = qy[head]
+        first = qf[head]
+        depth = qd[head]
+        head += 1
+        if depth >= max_depth:
+            continue
+        for k in range(4):
+            nx = x + _DX[k]
+            ny = y + _DY[k]
+            if _is_target(tx, ty, nx, ny):
+                return first
+            if x_min <= nx < x_max and y_min <= ny < y_max:
+                i = ny * w + nx
+                if not visited[i] and not occ[i]:
+                    visited[i] = 1
+                    qx[tail] = nx
+                    qy[tail] = ny
+                    qf[tail] = first
+                    qd[tail] = depth + 1
+                    tail += 1
+    return -1
+
+
+# Spawn directions in the order they are tried, as Direction values (right, left, up, down)
+_SPAWN_DIRS = np.array((3, 2, 0, 1), dtype=np.int32)
+
+
+def _spawn_clear(walls, w, x, y, d):
+    """True when the head cell, the 2 body cells behind it and the 3 cells ahead
+    are all wall-free for a snake facing direction index d."""
+    step = _DY[d] * w + _DX[d]
+    head = y * w + x
+    for k in range(-2, 4):
+        if walls[head + step * k]:
+            return False
+    return True
+
+
+def _find_safe_spawn(walls, w, x_min, x_max, y_min, y_max):
+    """Spiral out from the quadrant center, ring by ring in (dx, dy) order, to the
+    first cell with room for a spawning snake. Returns (x, y, direction index),
+    or (-1, -1, -1) when there is none."""
+    cx = (x_min + x_max) // 2
+    cy = (y_min + y_max) // 2
+    lo_x = x_min + 4
+    hi_x = x_max - 4
+    lo_y = y_min + 4
+    hi_y = y_max - 4
+    # Rings past the farthest edge of the head area can't hold a candidate
+    reach = max(cx - lo_x, hi_x - cx, cy - lo_y, hi_y - cy)
+    for offset in range(min(max(x_max - x_min, y_max - y_min), reach + 1)):
+        # Ring perimeter: left column, then the top/bottom pairs, then right column
+        n = 1 if offset == 0 else 8 * offset
+        for j in range(n):
+            if offset == 0:
+                dx = 0
+                dy = 0
+            elif j <= 2 * offset:
+                dx = -offset
+                dy = j - offset
+            elif j < 6 * offset - 1:
+                m = j - 2 * offset - 1
+                dx = -offset + 1 + m // 2
+                dy = -offset if m % 2 == 0 else offset
+            else:
+                dx = offset
+                dy = j - 7 * offset + 1
+            x = cx + dx
+            y = cy + dy
+            if x < lo_x or x > hi_x or y < lo_y or y > hi_y:
+                continue
+            for i in range(4):
+                d = _SPAWN_DIRS[i]
+                if _spawn_clear(walls, w, x, y, d):
+                    return x, y, d
+    return -1, -1, -1
+
+
+if HAVE_NUMBA:
+    _is_target = njit(cache=True)(_is_target)
+    _spawn_clear = njit(cache=True)(_spawn_clear)
+    flood_fill_count = njit(cache=True)(_flood_fill_count)
+    bfs_first_step = njit(cache=True)(_bfs_first_step)
+    find_safe_spawn = njit(cache=True)(_find_safe_spawn)
+else:
+    flood_fill_count = _flood_fill_count
+    bfs_first_step = _bfs_first_step
+    find_safe_spawn = _find_safe_spawn
+
+_warmed = False
+
+
+def warm_up():
+    """Compile the kernels on a tiny grid so the first AI decision doesn't pay for it."""
+    global _warmed
+    if _warmed or not HAVE_NUMBA:
+        return
+    occ = np.zeros(9, np.uint8)
+    target = np.array((2,), np.int32)
+    flood_fill_count(occ, 3, 0, 3, 0, 3, 1, 1, 2, 9)
+    bfs_first_step(occ, 3, 0, 3, 0, 3, 0, 0, target, target, 4)
+    find_safe_spawn(np.zeros(100, np.uint8), 10, 0, 10, 0, 10)
+    _warmed = True
@@ -2,13 +2,20 @@
 Leaderboard manager for storing and retrieving high scores
 """
 
+import atexit
+import bisect
 import json
 import os
 from datetime import datetime
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 from dataclasses import dataclass, asdict
 import threading
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
 @dataclass
 class LeaderboardEntry:
@@ -26,6 +33,7 @@ class LeaderboardManager:
     """Manages the leaderboard with file-based persistence"""
     
     MAX_ENTRIES = 500
+    SAVE_DELAY = 0.5  # seconds; scores added within this window are written once
     
     def __init__(self, data_dir: str = None):
         if data_dir is None:
@@ -35,8 +43,13 @@ class LeaderboardManager:
         self.data_dir = data_dir
         self.leaderboard_file = os.path.join(data_dir, 'leaderboard.json')
         self._lock = threading.Lock()
+        # Serialises file writes, so the data lock is never held across disk I/O
+        self._write_lock = threading.Lock()
+        self._save_timer: Optional[threading.Timer] = None
         self._ensure_data_dir()
         self._load()
+        # Don't lose a pending save on shutdown
+        atexit.register(self.flush)
     
     def _ensure_data_dir(self):
         """Ensure data directory exists"""
@@ -55,17 +68,56 @@ class LeaderboardManager:
                     ]
             except (json.JSONDecodeError, KeyError, TypeError):
                 self.entries = []
+        self._sort_entries()
+    
+    def _save(self, entries: List[Dict]):
+        """Save a snapshot of the entries to file, via a temp file and rename so a
+        crash mid-write can't leave it truncated"""
+        data = {'entries': entries}
+        if orjson is not None:
+            payload = orjson.dumps(data)
+        else:
+            payload = json.dumps(data).encode()
+        tmp_file = self.leaderboard_file + '.tmp'
+        with open(tmp_file, 'wb') as f:
+            f.write(payload)
+        os.replace(tmp_file, self.leaderboard_file)
+    
+    def _schedule_save(self):
+        """Save SAVE_DELAY from now on a timer thread, unless a save is already pending
+        (call with the lock held)"""
+        if self._save_timer is None:
+            self._save_timer = threading.Timer(self.SAVE_DELAY, self.flush)
+            self._save_timer.daemon = True
+            self._save_timer.start()
+    
+    def flush(self):
+        """Write any pending changes to disk now. The entries are copied under the lock
+        and written outside it; a failed write is logged and retried on the timer."""
+        with self._write_lock:
+            with self._lock:
+                if self._save_timer is None:
+                    return
+                self._save_timer.cancel()
+                self._save_timer = None
+                entries = [e.to_dict() for e in self.entries]
+            try:
+                self._save(entries)
+            except OSError as e:
+                print(f"Leaderboard save failed, retrying: {e}")
+                with self._lock:
+                    self._schedule_save()
     
-    def _save(self):
-        """Save leaderboard to file"""
-        with open(self.leaderboard_file, 'w') as f:
-            json.dump({
-                'entries': [e.to_dict() for e in self.entries]
-            }, f, indent=2)
+    @staticmethod
+    def _sort_key(score: int, date: str) -> Tuple[int, str]:
+        """Rank order: score (desc), then date (asc for tiebreaker - earlier is higher)"""
+        return (-score, date)
     
     def _sort_entries(self):
-        """Sort entries by score (desc), then by date (asc for tiebreaker - earlier is higher)"""
-        self.entries.sort(key=lambda e: (-e.score, e.date))
+        """Sort entries into rank order and rebuild the parallel list of sort keys"""
+        self.entries.sort(key=lambda e: self._sort_key(e.score, e.date))
+        # Kept in step with entries so inserts and rank lookups can bisect
+        self._keys: List[Tuple[int, str]] = [self._sort_key(e.score, e.date) for e in self.entries]
     
     def add_score(self, player_name: str, score: int, game_type: str = "snake_classic", 
                    game_mode: str = "single_player") -> Optional[int]:
@@ -83,21 +135,21 @@ class LeaderboardManager:
                 game_mode=game_mode
             )
             
-            # Add entry
-            self.entries.append(entry)
-            self._sort_entries()
+            # Insert after any entries it ties with (they were there first)
+            key = self._sort_key(score, date)
+            idx = bisect.bisect_right(self._keys, key)
+            if idx >= self.MAX_ENTRIES:
+                return None
+            self._keys.insert(idx, key)
+            self.entries.insert(idx, entry)
             
             # Trim to max entries
             if len(self.entries) > self.MAX_ENTRIES:
-                self.entries = self.entries[:self.MAX_ENTRIES]
+                self.entries.pop()
+                self._keys.pop()
             
-            # Check if entry is still in the list
-            try:
-                rank = self.entries.index(entry) + 1
-                self._save()
-                return rank
-            except ValueError:
-                return None
+            self._schedule_save()
+            return idx + 1
     
     def get_leaderboard(self) -> List[Dict]:
         """Get the leaderboard as a list of dicts"""
@@ -107,13 +159,9 @@ class LeaderboardManager:
     def get_rank_for_score(self, score: int) -> int:
         """Get what rank a score would achieve (for preview)"""
         with self._lock:
-            rank = 1
-            for entry in self.entries:
-                if entry.score > score:
-                    rank += 1
-                else:
-                    break
-            return rank
+            # (-score,) sorts before every key with this score, so this counts
+            # the entries with a strictly higher score
+            return bisect.bisect_left(self._keys, (-score,)) + 1
 
 
 # Singleton instance
@@ -18,6 +18,7 @@ except ImportError:
 
 from .websocket import connection_manager
 from .profiles import get_profile_manager
+from .grid_kernels import warm_up as warm_up_kernels
 
 
 VERSION = "0.5.0"
@@ -33,6 +34,12 @@ if CLIENT_DIR.exists():
     app.mount("/static", StaticFiles(directory=str(CLIENT_DIR)), name="static")
 
 
+@app.on_event("startup")
+async def compile_grid_kernels():
+    """JIT-compile the Numba grid kernels at boot so the first game doesn't pay for it"""
+    warm_up_kernels()
+
+
 @app.get("/")
 async def root():
     """Serve the main game page"""
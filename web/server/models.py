@@ -2,9 +2,11 @@
 Game state models for multiplayer snake games
 """
 
-from enum import Enum
+from enum import Enum, IntEnum
+from collections import deque
 from dataclasses import dataclass, field
-from typing import List, Dict, Optional, Tuple
+from functools import cached_property, lru_cache
+from typing import List, Dict, Optional, Tuple, Deque
 import random
 import time
 import math
@@ -42,11 +44,17 @@ TIME_LIMIT_ORDER = ["30s", "1m", "2m", "3m"]
 DEFAULT_TIME_LIMIT = "1m"
 
 
-class Direction(Enum):
-    UP = "up"
-    DOWN = "down"
-    LEFT = "left"
-    RIGHT = "right"
+class Direction(IntEnum):
+    # Opposite directions differ only in the low bit: UP ^ DOWN == LEFT ^ RIGHT == 1
+    UP = 0
+    DOWN = 1
+    LEFT = 2
+    RIGHT = 3
+
+
+# Wire names used by clients, indexed by Direction value
+DIRECTION_NAMES = ("up", "down", "left", "right")
+DIRECTION_FROM_NAME = {name: Direction(i) for i, name in enumerate(DIRECTION_NAMES)}
 
 
 class PlayerState(Enum):
@@ -128,21 +136,38 @@ AI_DIFFICULTY_SETTINGS = {
 }
 
 
-@dataclass
+# Snake segments are stored as packed cells, (y << CELL_SHIFT) | x, instead of Position
+# objects; the same value indexes the game manager's board grids. Boards must stay
+# narrower than 1 << CELL_SHIFT cells.
+CELL_SHIFT = 8
+CELL_MASK = (1 << CELL_SHIFT) - 1
+
+
+def cell(x: int, y: int) -> int:
+    """Pack grid coords into a cell key"""
+    return (y << CELL_SHIFT) | x
+
+
+@dataclass(frozen=True, slots=True)
 class Position:
     x: int
     y: int
     
     def to_dict(self):
         return {"x": self.x, "y": self.y}
-    
-    def __eq__(self, other):
-        if isinstance(other, Position):
-            return self.x == other.x and self.y == other.y
-        return False
-    
-    def __hash__(self):
-        return hash((self.x, self.y))
+
+
+@lru_cache(maxsize=65536)
+def P(x: int, y: int) -> Position:
+    """Interned Position — grid coords are small and repeat constantly, so share one instance per cell"""
+    return Position(x, y)
+
+
+@lru_cache(maxsize=65536)
+def cell_dict(c: int) -> dict:
+    """Serialised {"x", "y"} form of a packed cell, shared per cell so state messages
+    don't build a fresh dict for every body segment. Treat the result as read-only."""
+    return {"x": c & CELL_MASK, "y": c >> CELL_SHIFT}
 
 
 @dataclass
@@ -160,10 +185,18 @@ class Food:
     hit_recovery: float = 0.0  # Seconds until this animal can be hit again (non-consecutive rule)
     
     def to_dict(self):
+        d = self._static_dict.copy()
+        d["health"] = self.health
+        d["hit_recovery"] = round(self.hit_recovery, 2)
+        d["recovering"] = self.hit_recovery > 0
+        return d
+    
+    @cached_property
+    def _static_dict(self) -> dict:
+        # Everything but health and hit recovery is fixed once the food spawns
         return {
             "position": self.position.to_dict(),
             "value": self.value,
-            "health": self.health,
             "max_health": self.max_health,
             "color": self.color,
             "colors": self.colors,
@@ -171,16 +204,21 @@ class Food:
             "size": self.size,
             "cells": self.cells,
             "category": self.category,
-            "hit_recovery": round(self.hit_recovery, 2),
-            "recovering": self.hit_recovery > 0,
         }
     
-    def get_all_positions(self) -> List[Position]:
+    def get_all_positions(self) -> Tuple[Position, ...]:
         """Get all positions occupied by this food"""
-        positions = []
-        for dx, dy in self.cells:
-            positions.append(Position(self.position.x + dx, self.position.y + dy))
-        return positions
+        return self._positions
+    
+    @cached_property
+    def _positions(self) -> Tuple[Position, ...]:
+        # A food never moves or changes shape once spawned, so build this once
+        return tuple(P(self.position.x + dx, self.position.y + dy) for dx, dy in self.cells)
+    
+    @cached_property
+    def cell_ids(self) -> Tuple[int, ...]:
+        """All occupied cells as packed cell indices (see cell())"""
+        return tuple(cell(p.x, p.y) for p in self._positions)
 
 
 @dataclass
@@ -197,19 +235,26 @@ class Wall:
             "height": self.height
         }
     
-    def get_all_positions(self) -> List[Position]:
+    def get_all_positions(self) -> Tuple[Position, ...]:
         """Get all positions occupied by this wall"""
-        positions = []
-        for dx in range(self.width):
-            for dy in range(self.height):
-                positions.append(Position(self.position.x + dx, self.position.y + dy))
-        return positions
+        return self._positions
+    
+    @cached_property
+    def _positions(self) -> Tuple[Position, ...]:
+        # Walls never move after generation, so build this once
+        return tuple(P(self.position.x + dx, self.position.y + dy)
+                     for dx in range(self.width) for dy in range(self.height))
 
 
 @dataclass
 class Snake:
     player_id: int
-    body: List[Position] = field(default_factory=list)
+    # Packed cells (see cell()), head at body[0], tail at body[-1]; a deque keeps
+    # push-head / pop-tail O(1)
+    body: Deque[int] = field(default_factory=deque)
+    # cell -> number of body segments on it, for O(1) self-collision checks (a snake that
+    # eats while stepping onto its own tail briefly holds that cell twice)
+    body_cells: Dict[int, int] = field(default_factory=dict)
     direction: Direction = Direction.RIGHT
     next_direction: Direction = Direction.RIGHT
     color: str = "#00FF00"
@@ -221,12 +266,13 @@ class Snake:
     decay_timer: float = 6.0
     # Spawn freeze: snake is visible but invulnerable and cannot move (seconds remaining)
     spawn_freeze: float = 0.0
+    # Head pushes so far; lets the game loop send only the cells added since its last frame
+    moves: int = 0
     
-    def to_dict(self):
-        return {
+    def to_dict(self, include_body: bool = True):
+        d = {
             "player_id": self.player_id,
-            "body": [p.to_dict() for p in self.body],
-            "direction": self.direction.value,
+            "direction": DIRECTION_NAMES[self.direction],
             "color": self.color,
             "alive": self.alive,
             "score": self.score,
@@ -234,6 +280,9 @@ class Snake:
             "decay_timer": self.decay_timer,
             "spawn_freeze": round(self.spawn_freeze, 2)
         }
+        if include_body:
+            d["body"] = [cell_dict(c) for c in self.body]
+        return d
 
 
 @dataclass
@@ -244,22 +293,22 @@ class Player:
     state: PlayerState = PlayerState.WAITING
     snake: Optional[Snake] = None
     quadrant: int = 0  # 0-3 for which quadrant they're in
-    death_time: Optional[float] = None
+    death_time: Optional[int] = None  # time.monotonic_ns() at death
     rank: int = 0
     is_ai: bool = False
     ai_difficulty: str = "amateur"  # amateur, semi_pro, pro, world_class
-    ai_last_decision: float = 0  # Timestamp of last AI decision
+    ai_last_decision: int = 0  # time.monotonic_ns() of last AI decision
     death_count: int = 0          # Number of deaths this game (drives respawn penalty)
     respawn_delay: float = 2.0    # Current respawn delay in seconds (fibonacci-based)
     
-    def to_dict(self):
+    def to_dict(self, include_body: bool = True, now_ns: Optional[int] = None):
         d = {
             "id": self.id,
             "name": self.name,
             "state": self.state.value,
             "quadrant": self.quadrant,
             "rank": self.rank,
-            "snake": self.snake.to_dict() if self.snake else None,
+            "snake": self.snake.to_dict(include_body) if self.snake else None,
             "is_ai": self.is_ai,
             "ai_difficulty": self.ai_difficulty,
             "death_count": self.death_count,
@@ -267,7 +316,9 @@ class Player:
         }
         # Include remaining respawn time so client can display a countdown
         if self.death_time and self.state == PlayerState.DEAD:
-            d["respawn_remaining"] = max(0.0, round(self.respawn_delay - (time.time() - self.death_time), 1))
+            if now_ns is None:
+                now_ns = time.monotonic_ns()
+            d["respawn_remaining"] = max(0.0, round(self.respawn_delay - (now_ns - self.death_time) / 1e9, 1))
         else:
             d["respawn_remaining"] = 0.0
         return d
@@ -313,7 +364,7 @@ class GameState:
     winner_id: Optional[int] = None
     
     # Timing
-    start_time: float = 0
+    start_time: float = 0  # time.monotonic() when the game started
     elapsed_time: float = 0
     time_limit: float = 180  # 3 minutes for high score mode
     
@@ -343,6 +394,7 @@ class GameState:
     foods: Dict[int, List[Food]] = field(default_factory=dict)  # Per quadrant
     quadrant_bounds: Dict[int, QuadrantBounds] = field(default_factory=dict)
     walls: Dict[int, List[Wall]] = field(default_factory=dict)  # Per quadrant
+    walls_version: int = 0  # Changes whenever a new set of walls is placed
     
     # Stats
     alive_count: int = 0
@@ -353,8 +405,10 @@ class GameState:
     current_round: int = 1
     series_winner_id: Optional[int] = None
     
-    def to_dict(self):
-        return {
+    def to_dict(self, include_walls: bool = True):
+        """Full state dict. With include_walls False the walls are left out for the
+        caller to fill in from a copy serialised once (see walls_version)."""
+        d = {
             "game_type": self.game_type.value,
             "mode": self.mode.value,
             "barrier_density": self.barrier_density,
@@ -368,10 +422,10 @@ class GameState:
             "elapsed_time": self.elapsed_time,
             "time_limit": self.time_limit,
             "current_speed": self.current_speed,
-            "players": {pid: p.to_dict() for pid, p in self.players.items()},
+            "players": self._players_dict(True),
             "foods": {q: [f.to_dict() for f in foods] for q, foods in self.foods.items()},
             "quadrant_bounds": {q: b.to_dict() for q, b in self.quadrant_bounds.items()},
-            "walls": {q: [w.to_dict() for w in walls] for q, walls in self.walls.items()},
+            "walls_version": self.walls_version,
             "alive_count": self.alive_count,
             "single_player_high_score": self.single_player_high_score,
             "survival_decay_current_interval": self.survival_decay_current_interval,
@@ -381,11 +435,20 @@ class GameState:
             "current_round": self.current_round,
             "series_winner_id": self.series_winner_id,
         }
+        if include_walls:
+            d["walls"] = {q: [w.to_dict() for w in walls] for q, walls in self.walls.items()}
+        return d
+
+    def _players_dict(self, include_bodies: bool) -> dict:
+        # One clock read per message for every player's respawn countdown
+        now_ns = time.monotonic_ns()
+        return {pid: p.to_dict(include_bodies, now_ns) for pid, p in self.players.items()}
 
-    def to_dict_delta(self):
+    def to_dict_delta(self, include_bodies: bool = True, include_foods: bool = True):
         """Lightweight state dict excluding static fields (walls, quadrant_bounds).
-        Clients merge this with the initial full state received at game_start."""
-        return {
+        Clients merge this with the initial full state received at game_start.
+        With include_bodies/include_foods False those are left out for the caller to encode."""
+        d = {
             "running": self.running,
             "paused": self.paused,
             "game_over": self.game_over,
@@ -393,8 +456,8 @@ class GameState:
             "elapsed_time": self.elapsed_time,
             "time_limit": self.time_limit,
             "current_speed": self.current_speed,
-            "players": {pid: p.to_dict() for pid, p in self.players.items()},
-            "foods": {q: [f.to_dict() for f in foods] for q, foods in self.foods.items()},
+            "players": self._players_dict(include_bodies),
+            "walls_version": self.walls_version,
             "alive_count": self.alive_count,
             "survival_decay_current_interval": self.survival_decay_current_interval,
             "survival_speed_next_increase": self.survival_speed_next_increase,
@@ -403,6 +466,9 @@ class GameState:
             "current_round": self.current_round,
             "series_winner_id": self.series_winner_id,
         }
+        if include_foods:
+            d["foods"] = {q: [f.to_dict() for f in foods] for q, foods in self.foods.items()}
+        return d
 
 
 # Map size configurations (matching pygame version)
@@ -624,11 +690,12 @@ CATEGORY_WEIGHTS = {
 }
 
 
-def get_random_food() -> dict:
-    """Get a random food type based on weighted probability"""
+def get_random_food(rng: Optional[random.Random] = None) -> dict:
+    """Get a random food type based on weighted probability (drawn from rng if given)"""
+    randint = (rng or random).randint
     # First select category
     category_total = sum(CATEGORY_WEIGHTS.values())
-    r = random.randint(1, category_total)
+    r = randint(1, category_total)
     cumulative = 0
     selected_category = "small"
     
@@ -649,7 +716,7 @@ def get_random_food() -> dict:
         category_animals = list(ANIMAL_TYPES.items())
     
     total_weight = sum(a[1]["weight"] for a in category_animals)
-    r = random.randint(1, total_weight)
+    r = randint(1, total_weight)
     cumulative = 0
     
     for name, data in category_animals:
@@ -108,8 +108,8 @@ class DuelSimulator:
                     print(f"      - {f.food_type} at ({f.position.x}, {f.position.y}), value={f.value}")
             for pid, p in game_manager.state.players.items():
                 if p.snake:
-                    print(f"  Player {pid}: head={p.snake.body[0] if p.snake.body else 'N/A'}, "
-                          f"dir={p.snake.direction.value if p.snake.direction else 'N/A'}, "
+                    print(f"  Player {pid}: head={p.snake.to_dict()['body'][0] if p.snake.body else 'N/A'}, "
+                          f"dir={p.snake.direction.name.lower()}, "
                           f"quadrant={p.quadrant}, body_len={len(p.snake.body) if p.snake.body else 0}")
         
         while game_manager.state.running and not game_manager.state.game_over and ticks < max_ticks:
@@ -126,7 +126,7 @@ class DuelSimulator:
                         if p.snake and not p.snake.alive:
                             print(f"  Elapsed {game_manager.state.elapsed_time:.2f}s: Player {pid} DIED")
                             if p.snake.body:
-                                print(f"    Last head position: {p.snake.body[0]}")
+                                print(f"    Last head position: {p.snake.to_dict()['body'][0]}")
             
             ticks += 1
             
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Grid kernel agreement check.
+Runs each Numba kernel's source as plain Python against the NumPy / pure-Python
+path GameManager takes without numba, on seeded boards, and fails on any mismatch.
+"""
+
+import sys
+import os
+import random
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from server import game_manager, grid_kernels
+from server.models import GameMode, GameType, Player, CELL_MASK, CELL_SHIFT
+from server.game_manager import GameManager
+from server.room_manager import Room
+
+
+SEEDS = range(8)
+BOARDS = [
+    (GameMode.SURVIVAL, "dense", 1, 3, "medium"),
+    (GameMode.BATTLE_ROYALE, "moderate", 1, 5, "large"),
+    (GameMode.DUEL, "dense", 1, 1, "small"),
+]
+
+
+async def _no_broadcast(message):
+    pass
+
+
+def _make_game(seed, mode, density, humans, ai, size) -> GameManager:
+    room = Room(code="KERN", host_id=1, game_type=GameType.SNAKE_CLASSIC, game_mode=mode)
+    room.barrier_density = density
+    room.map_size = size
+    for i in range(humans):
+        room.players[i + 1] = Player(id=i + 1, name=f"P{i + 1}")
+    room.ai_count = ai
+    gm = GameManager(room, _no_broadcast, seed=seed)
+    gm.setup_game()
+    return gm
+
+
+def _kernel_paths(use_kernels: bool):
+    """Point game_manager at the uncompiled kernel sources, or back at its fallbacks"""
+    game_manager.HAVE_NUMBA = use_kernels
+    game_manager.flood_fill_count = grid_kernels._flood_fill_count
+    game_manager.bfs_first_step = grid_kernels._bfs_first_step
+    game_manager.find_safe_spawn = grid_kernels._find_safe_spawn
+
+
+def _boards():
+    for seed in SEEDS:
+        for board in BOARDS:
+            yield seed, _make_game(seed, *board)
+
+
+def test_wall_connectivity():
+    saved = game_manager.HAVE_NUMBA
+    try:
+        for seed, gm in _boards():
+            for quadrant, bounds in gm.state.quadrant_bounds.items():
+                _kernel_paths(False)
+                expected = gm._check_wall_connectivity(quadrant, bounds)
+                _kernel_paths(True)
+                got = gm._check_wall_connectivity(quadrant, bounds)
+                assert got == expected, f"seed {seed} quadrant {quadrant}: {got} != {expected}"
+    finally:
+        game_manager.HAVE_NUMBA = saved
+
+
+def test_find_safe_spawn():
+    saved = game_manager.HAVE_NUMBA
+    try:
+        for seed, gm in _boards():
+            for quadrant in gm.state.quadrant_bounds:
+                _kernel_paths(False)
+                expected = gm._find_safe_spawn(quadrant)
+                _kernel_paths(True)
+                got = gm._find_safe_spawn(quadrant)
+                assert got == expected, f"seed {seed} quadrant {quadrant}: {got} != {expected}"
+    finally:
+        game_manager.HAVE_NUMBA = saved
+
+
+def test_flood_fill_and_food_bfs():
+    rng = random.Random(0)
+    for seed, gm in _boards():
+        for player in gm.state.players.values():
+            bounds = gm.state.quadrant_bounds[player.quadrant]
+            walk_np, walk = gm._ai_walkable(bounds)
+            free = walk_np[1:-1, 1:-1].view(bool)
+            area = (bounds.x_max - bounds.x_min) * (bounds.y_max - bounds.y_min)
+            head = player.snake.body[0]
+            hx, hy = head & CELL_MASK, head >> CELL_SHIFT
+            for depth in (5, 15, 40):
+                for _ in range(20):
+                    sx = rng.randrange(bounds.x_min - 1, bounds.x_max + 1)
+                    sy = rng.randrange(bounds.y_min - 1, bounds.y_max + 1)
+                    expected = gm._flood_fill_count(sx, sy, bounds, free, depth)
+                    got = grid_kernels._flood_fill_count(
+                        gm._occ_np, gm._stride, bounds.x_min, bounds.x_max,
+                        bounds.y_min, bounds.y_max, sx, sy, depth, area)
+                    assert got == expected, f"seed {seed} flood ({sx}, {sy}) depth {depth}: {got} != {expected}"
+
+                targets = {(rng.randrange(bounds.x_min, bounds.x_max),
+                            rng.randrange(bounds.y_min, bounds.y_max)) for _ in range(3)}
+                expected = gm._ai_bfs_to_food(hx, hy, targets, bounds, walk, gm._occ_np, depth)
+                tx = np.array([t[0] for t in targets], dtype=np.int32)
+                ty = np.array([t[1] for t in targets], dtype=np.int32)
+                step = grid_kernels._bfs_first_step(
+                    gm._occ_np, gm._stride, bounds.x_min, bounds.x_max,
+                    bounds.y_min, bounds.y_max, hx, hy, tx, ty, depth)
+                got = step if step >= 0 else None
+                assert got == expected, f"seed {seed} bfs from ({hx}, {hy}) depth {depth}: {got} != {expected}"
+
+
+def main():
+    for test in (test_wall_connectivity, test_find_safe_spawn, test_flood_fill_and_food_bfs):
+        test()
+        print(f"{test.__name__}: ok")
+
+
+if __name__ == "__main__":
+    main()
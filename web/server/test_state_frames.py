@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+game_state delta frame replay check.
+Plays seeded games tick by tick, decodes every game_state frame the way the
+client's StateDecoder does, and compares the rebuilt bodies and foods with
+GameManager.full_state() after each frame, including after dropped frames and
+a per-client resync keyframe.
+"""
+
+import sys
+import os
+import json
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from server.models import GameMode, GameType, Player
+from server.game_manager import GameManager
+from server.room_manager import Room
+
+
+TICKS = 400
+GAMES = [
+    (GameMode.SURVIVAL, "dense", 1, 3, "medium"),
+    (GameMode.HIGH_SCORE, "moderate", 2, 2, "large"),
+    (GameMode.BATTLE_ROYALE, "sparse", 1, 5, "extra_large"),
+]
+
+
+class StateDecoder:
+    """Python port of web/client/js/engine/StateDecoder.js"""
+
+    def __init__(self):
+        self.body_frame = None
+
+    def decode(self, state: dict, prev_state: dict) -> dict:
+        if state.get("frame") is None:
+            return state
+        in_sync = (not state.get("key") and self.body_frame is not None
+                   and self.body_frame == state.get("base"))
+        prev_players = (prev_state or {}).get("players") or {}
+
+        if not state.get("foods"):
+            state["foods"] = (in_sync and prev_state and prev_state.get("foods")) or {}
+
+        for pid, player in (state.get("players") or {}).items():
+            snake = player.get("snake")
+            if not snake or "body" in snake:
+                continue
+            prev_snake = (prev_players.get(pid) or {}).get("snake")
+            prev_body = (prev_snake or {}).get("body") or []
+            snake["body"] = (snake["head"] + prev_body)[:snake["len"]] if in_sync else prev_body
+
+        self.body_frame = state["frame"] if (state.get("key") or in_sync) else None
+        return state
+
+
+async def _no_broadcast(message):
+    pass
+
+
+def _wire(message: dict) -> dict:
+    """What a client receives: the message after a JSON round trip"""
+    return json.loads(json.dumps(message))
+
+
+def _make_game(seed, mode, density, humans, ai, size) -> GameManager:
+    room = Room(code="FRAME", host_id=1, game_type=GameType.SNAKE_CLASSIC, game_mode=mode)
+    room.barrier_density = density
+    room.map_size = size
+    for i in range(humans):
+        room.players[i + 1] = Player(id=i + 1, name=f"P{i + 1}")
+    room.ai_count = ai
+    gm = GameManager(room, _no_broadcast, seed=seed)
+    gm.setup_game()
+    return gm
+
+
+def _assert_matches(decoded: dict, gm: GameManager, where: str):
+    expected = _wire({"state": gm.full_state(include_walls=False)})["state"]
+    for pid, player in expected["players"].items():
+        snake = player.get("snake")
+        if snake:
+            got = decoded["players"][pid]["snake"]["body"]
+            assert got == snake["body"], f"{where}: player {pid} body {got} != {snake['body']}"
+    assert decoded["foods"] == expected["foods"], f"{where}: foods differ"
+
+
+def _replay(seed, game, drop_every=0):
+    """Replay TICKS ticks; with drop_every, that client misses a run of frames every
+    drop_every ticks and is resynced with _resync_frame as the server does"""
+    gm = _make_game(seed, *game)
+    decoder = StateDecoder()
+    held = _wire({"state": gm.full_state()})["state"]
+    frames = 0
+    for tick in range(TICKS):
+        if not gm.state.running or gm.state.game_over:
+            break
+        gm.update(gm.state.current_speed / 1000)
+        gm._tick += 1
+        if gm._dirty:
+            gm._dirty = False
+            frame = _wire({"type": "game_state", "state": gm._state_frame()})
+            if drop_every and tick % drop_every == 3:
+                # The outbox overflowed on the last frames; this client gets a keyframe
+                frame = _wire(gm._resync_frame())
+            if not (drop_every and tick % drop_every in (1, 2)):
+                held = decoder.decode(frame["state"], held)
+                frames += 1
+                _assert_matches(held, gm, f"seed {seed} {game[0].value} tick {tick}")
+        if gm.state.mode in (GameMode.HIGH_SCORE, GameMode.BATTLE_ROYALE):
+            for player in list(gm.state.players.values()):
+                if player.death_time is not None and player.snake and not player.snake.alive:
+                    gm._respawn_snake(player)
+    return frames
+
+
+def test_delta_frames_rebuild_full_state():
+    for seed in range(3):
+        for game in GAMES:
+            assert _replay(seed, game) > 0
+
+
+def test_resync_keyframe_after_dropped_frames():
+    for seed in range(3):
+        for game in GAMES:
+            assert _replay(seed, game, drop_every=17) > 0
+
+
+def main():
+    for test in (test_delta_frames_rebuild_full_state, test_resync_keyframe_after_dropped_frames):
+        test()
+        print(f"{test.__name__}: ok")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,9 +4,15 @@ WebSocket handlers for multiplayer game communication
 
 import json
 import asyncio
-from typing import Dict, Set, Optional, List
+from collections import deque
+from typing import Callable, Dict, Set, Optional, List
 from fastapi import WebSocket, WebSocketDisconnect
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from .models import GameType, GameMode, PlayerState
 from .room_manager import RoomManager, Room
 from .game_manager import GameManager
@@ -15,12 +21,86 @@ from .leaderboard import get_leaderboard_manager
 from .profiles import get_profile_manager
 
 
+if orjson is not None:
+    # Player-keyed dicts use int keys, which orjson only encodes with OPT_NON_STR_KEYS
+    _ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+    
+    def encode_message(message: dict) -> str:
+        """Serialize an outgoing message to JSON text (orjson, C-accelerated)"""
+        return orjson.dumps(message, option=_ORJSON_OPTIONS).decode()
+else:
+    def encode_message(message: dict) -> str:
+        """Serialize an outgoing message to JSON text"""
+        return json.dumps(message)
+
+
+class Outbox:
+    """Per-connection queue for per-tick game frames.
+    
+    The game loop pushes frames without waiting on the socket; a background task
+    drains them in order. Only game_tick frames can be superseded by later ones, so
+    they are what a client more than MAX_FRAMES behind loses first. game_state frames
+    between keyframes are deltas on the frame before them and can't be skipped: if the
+    queue is still full of those, it is emptied and the client gets nothing more until
+    it is sent a keyframe. push() reports that, so the caller can queue one for this
+    connection alone.
+    """
+    
+    MAX_FRAMES = 4
+    
+    def __init__(self, websocket: WebSocket):
+        self.websocket = websocket
+        self.frames: deque = deque()  # (frame, droppable)
+        self.needs_keyframe = False
+        self.task: Optional[asyncio.Task] = None
+    
+    def push(self, frame: str, keyframe: bool = False, droppable: bool = False) -> bool:
+        """Queue a serialized frame, starting the writer if it is idle. `droppable`
+        frames may be discarded when the client falls behind.
+        Returns True while the connection is waiting for a keyframe to resync."""
+        frames = self.frames
+        if keyframe:
+            if len(frames) >= self.MAX_FRAMES:
+                # A keyframe carries the full state; nothing queued is needed any more
+                frames.clear()
+            self.needs_keyframe = False
+        elif self.needs_keyframe:
+            return True
+        elif len(frames) >= self.MAX_FRAMES:
+            self.frames = frames = deque(f for f in frames if not f[1])
+            if len(frames) >= self.MAX_FRAMES:
+                if droppable:
+                    return False
+                frames.clear()
+                self.needs_keyframe = True
+                return True
+        frames.append((frame, droppable))
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self._drain())
+        return False
+    
+    async def flush(self):
+        """Wait until every queued frame has been written"""
+        if self.task is not None and not self.task.done():
+            await self.task
+    
+    async def _drain(self):
+        while self.frames:
+            frame, _ = self.frames.popleft()
+            try:
+                await self.websocket.send_text(frame)
+            except Exception:
+                self.frames.clear()
+                return
+
+
 class ConnectionManager:
     """Manages WebSocket connections and message routing"""
     
     def __init__(self):
         self.room_manager = RoomManager()
         self.active_connections: Dict[int, WebSocket] = {}  # player_id -> websocket
+        self.outboxes: Dict[WebSocket, Outbox] = {}  # websocket -> queued game frames
         self.game_managers: Dict[str, GameManager] = {}  # room_code -> snake game_manager
         self.brawler_game_managers: Dict[str, BrawlerGameManager] = {}  # room_code -> brawler game_manager
     
@@ -32,6 +112,7 @@ class ConnectionManager:
     async def disconnect(self, player_id: int):
         """Handle disconnection"""
         if player_id in self.active_connections:
+            self.outboxes.pop(self.active_connections[player_id], None)
             del self.active_connections[player_id]
         
         room = await self.room_manager.leave_room(player_id)
@@ -45,7 +126,7 @@ class ConnectionManager:
     async def send_personal(self, websocket: WebSocket, message: dict):
         """Send message to a specific connection"""
         try:
-            await websocket.send_json(message)
+            await websocket.send_text(encode_message(message))
         except Exception:
             pass
     
@@ -54,7 +135,7 @@ class ConnectionManager:
         room = self.room_manager.get_room(room_code)
         if not room:
             return
-        serialized = json.dumps(message)
+        serialized = encode_message(message)
         sockets: List[WebSocket] = [
             p.websocket for p in room.players.values() if p.websocket
         ]
@@ -62,17 +143,44 @@ class ConnectionManager:
             return
         async def _send(ws):
             try:
+                # Keep ordering with frames still queued by the game loop
+                outbox = self.outboxes.get(ws)
+                if outbox is not None:
+                    await outbox.flush()
                 await ws.send_text(serialized)
             except Exception:
                 pass
         await asyncio.gather(*(_send(ws) for ws in sockets))
 
+    def broadcast_to_room_nowait(self, room_code: str, message: dict,
+                                 resync: Optional[Callable[[], dict]] = None):
+        """Queue a per-tick frame for every player in a room without waiting on any socket.
+        A player who fell behind and is waiting to resync is sent resync() instead, a
+        keyframe built (once per call) only when some player needs it."""
+        room = self.room_manager.get_room(room_code)
+        if not room:
+            return
+        serialized = encode_message(message)
+        keyframe = message.get("type") == "game_state" and message["state"].get("key", False)
+        droppable = message.get("type") == "game_tick"
+        resync_serialized = None
+        for p in room.players.values():
+            ws = p.websocket
+            if ws:
+                outbox = self.outboxes.get(ws)
+                if outbox is None:
+                    outbox = self.outboxes[ws] = Outbox(ws)
+                if outbox.push(serialized, keyframe, droppable) and resync is not None:
+                    if resync_serialized is None:
+                        resync_serialized = encode_message(resync())
+                    outbox.push(resync_serialized, keyframe=True)
+
     async def broadcast_to_room_except(self, room_code: str, exclude_player_id: int, message: dict):
         """Broadcast to room except one player (parallel, pre-serialized)."""
         room = self.room_manager.get_room(room_code)
         if not room:
             return
-        serialized = json.dumps(message)
+        serialized = encode_message(message)
         sockets: List[WebSocket] = [
             p.websocket for p in room.players.values()
             if p.id != exclude_player_id and p.websocket
@@ -81,6 +189,9 @@ class ConnectionManager:
             return
         async def _send(ws):
             try:
+                outbox = self.outboxes.get(ws)
+                if outbox is not None:
+                    await outbox.flush()
                 await ws.send_text(serialized)
             except Exception:
                 pass
@@ -351,17 +462,20 @@ class ConnectionManager:
             game_manager.start()
         else:
             # Snake game
-            game_manager = GameManager(room, broadcast_callback)
+            def broadcast_nowait_callback(message, resync=None):
+                self.broadcast_to_room_nowait(room.code, message, resync)
+            
+            game_manager = GameManager(room, broadcast_callback, broadcast_nowait_callback)
             self.game_managers[room.code] = game_manager
             
             # Setup the game state BEFORE countdown so clients can render the map
-            game_manager.setup_game()
+            await game_manager.setup_game_async()
             
             # Notify players game is starting — include initial state so map renders immediately
             await self.broadcast_to_room(room.code, {
                 "type": "game_starting",
                 "countdown": 3,
-                "initial_state": game_manager.state.to_dict()
+                "initial_state": game_manager.full_state()
             })
             
             # Countdown (map is rendering on clients during this time)